@@ -1,7 +1,11 @@
 import os
+import json
 import logging
+import sqlite3
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 
@@ -28,6 +32,112 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
 }
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+@event.listens_for(Engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Make SQLite enforce foreign keys and ON DELETE CASCADE, as Postgres does"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def parse_days_by_source(value):
+    """Read per-source retention periods from a JSON object or "source=days,source=days" pairs"""
+    value = value.strip()
+    if value.startswith('{'):
+        pairs = json.loads(value).items()
+    else:
+        pairs = (pair.split('=', 1) for pair in value.split(',') if pair.strip())
+    return {source.strip(): int(days) for source, days in pairs}
+
+# Configure the crawl engine
+app.config["SCRAPER_MAX_WORKERS"] = int(os.environ.get("SCRAPER_MAX_WORKERS", 6))
+app.config["SCRAPER_MAX_CONNECTIONS"] = int(os.environ.get("SCRAPER_MAX_CONNECTIONS", 8))
+app.config["SCRAPER_BATCH_SIZE"] = int(os.environ.get("SCRAPER_BATCH_SIZE", 25))
+app.config["SCRAPER_FLUSH_INTERVAL"] = float(os.environ.get("SCRAPER_FLUSH_INTERVAL", 30))
+
+# Incremental crawls stop paging once this share of a listing page's links is
+# already stored; backfill crawls ignore it and walk this many pages instead
+app.config["SCRAPER_KNOWN_RATIO"] = float(os.environ.get("SCRAPER_KNOWN_RATIO", 1.0))
+app.config["SCRAPER_BACKFILL_PAGES"] = int(os.environ.get("SCRAPER_BACKFILL_PAGES", 10))
+
+# Per-host rate limits: requests per second, burst size and the bounds the
+# rate may adapt within; hosts not listed use the default
+app.config["SCRAPER_RATE_LIMIT_DEFAULT"] = {
+    "rate": float(os.environ.get("SCRAPER_DEFAULT_RATE", 1.0)),
+    "burst": 2,
+    "min_rate": 0.1,
+    "max_rate": 4.0,
+    "target_latency": 2.0,
+}
+app.config["SCRAPER_RATE_LIMITS"] = {
+    "www.sylhettoday24.news": {"rate": 0.5, "max_rate": 1.0},
+    "dailysylhet.com": {"rate": 0.5, "max_rate": 1.0},
+    "sylhetprotikhon.com": {"rate": 0.5, "max_rate": 1.0},
+    "www.thedailystar.net": {"rate": 1.0, "max_rate": 3.0},
+    "bdnews24.com": {"rate": 1.0, "max_rate": 3.0},
+    "www.dhakatribune.com": {"rate": 1.0, "max_rate": 3.0},
+}
+
+# Conditional-request cache for listing pages
+app.config["RESPONSE_CACHE_DIR"] = os.environ.get(
+    "RESPONSE_CACHE_DIR", os.path.join(app.instance_path, "http_cache")
+)
+app.config["RESPONSE_CACHE_MAX_BYTES"] = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+app.config["RESPONSE_CACHE_MAX_AGE"] = int(os.environ.get("RESPONSE_CACHE_MAX_AGE", 7 * 24 * 3600))
+
+# Which RSS/Atom feed or sitemap each source offers, re-probed after the TTL
+app.config["FEED_DIRECTORY_FILE"] = os.environ.get(
+    "FEED_DIRECTORY_FILE", os.path.join(app.instance_path, "feeds.json")
+)
+app.config["FEED_DIRECTORY_TTL"] = int(os.environ.get("FEED_DIRECTORY_TTL", 24 * 3600))
+
+# Article counts shown with listings are cached for this many seconds
+app.config["LISTING_COUNT_TTL"] = int(os.environ.get("LISTING_COUNT_TTL", 300))
+# ...for at most this many filter combinations, least recently used dropped first
+app.config["LISTING_COUNT_CACHE_SIZE"] = int(os.environ.get("LISTING_COUNT_CACHE_SIZE", 1000))
+
+# Rows fetched per round trip while streaming exports
+app.config["EXPORT_BATCH_SIZE"] = int(os.environ.get("EXPORT_BATCH_SIZE", 500))
+
+# Rows per Parquet row group / Arrow record batch in columnar exports
+app.config["EXPORT_ROW_GROUP_SIZE"] = int(os.environ.get("EXPORT_ROW_GROUP_SIZE", 10000))
+
+# Articles are deleted this many days after they were scraped; sources listed
+# in RETENTION_DAYS_BY_SOURCE (e.g. "Daily Sylhet=90,Sylhet Today=60" or a
+# JSON object) keep theirs for a different number of days
+app.config["RETENTION_DAYS"] = int(os.environ.get("RETENTION_DAYS", 30))
+app.config["RETENTION_DAYS_BY_SOURCE"] = parse_days_by_source(os.environ.get("RETENTION_DAYS_BY_SOURCE", ""))
+app.config["RETENTION_BATCH_SIZE"] = int(os.environ.get("RETENTION_BATCH_SIZE", 1000))
+
+# Expired articles are dropped, or first moved to the article_archive table
+# ("table") or to gzipped NDJSON files in RETENTION_ARCHIVE_DIR ("file")
+app.config["RETENTION_ARCHIVE"] = os.environ.get("RETENTION_ARCHIVE", "")
+app.config["RETENTION_ARCHIVE_DIR"] = os.environ.get(
+    "RETENTION_ARCHIVE_DIR", os.path.join(app.instance_path, "archive")
+)
+
+# Scrape jobs run on this many worker threads per process; idle workers poll
+# the queue every JOB_POLL_INTERVAL seconds, and running jobs whose worker sent
+# no heartbeat for JOB_STALE_AFTER seconds are put back in the queue
+app.config["JOB_WORKERS"] = int(os.environ.get("JOB_WORKERS", 1))
+app.config["JOB_POLL_INTERVAL"] = float(os.environ.get("JOB_POLL_INTERVAL", 5))
+app.config["JOB_STALE_AFTER"] = int(os.environ.get("JOB_STALE_AFTER", 600))
+
+# Each source is crawled about when SCRAPER_TARGET_YIELD new articles are
+# expected, judging by what its crawls saved over the last
+# SCRAPER_YIELD_WINDOW_DAYS days, but never more often than SCRAPER_MIN_INTERVAL
+# or less often than SCRAPER_MAX_INTERVAL seconds. Sources without history
+# use SCRAPER_DEFAULT_INTERVAL.
+app.config["SCRAPER_TARGET_YIELD"] = float(os.environ.get("SCRAPER_TARGET_YIELD", 5))
+app.config["SCRAPER_YIELD_WINDOW_DAYS"] = int(os.environ.get("SCRAPER_YIELD_WINDOW_DAYS", 7))
+app.config["SCRAPER_MIN_INTERVAL"] = int(os.environ.get("SCRAPER_MIN_INTERVAL", 15 * 60))
+app.config["SCRAPER_MAX_INTERVAL"] = int(os.environ.get("SCRAPER_MAX_INTERVAL", 12 * 3600))
+app.config["SCRAPER_DEFAULT_INTERVAL"] = int(os.environ.get("SCRAPER_DEFAULT_INTERVAL", 4 * 3600))
+
+# Only the process holding the scheduler lease runs scheduled work. The holder
+# renews it every third of the TTL; another process takes over once it expires
+app.config["SCHEDULER_LEASE_TTL"] = int(os.environ.get("SCHEDULER_LEASE_TTL", 90))
+
 # Initialize the app with the extension
 db.init_app(app)
 
@@ -36,6 +146,10 @@ with app.app_context():
     import models
     db.create_all()
 
+    # Indexes and tables create_all cannot manage go through versioned migrations
+    from migrations import migrate
+    migrate()
+
 # Import routes
 import routes
 
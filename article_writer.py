@@ -0,0 +1,114 @@
+import time
+import logging
+from sqlalchemy.dialects import postgresql, sqlite
+from app import app, db
+from models import Article
+from fingerprints import cluster_articles
+from fulltext import index_articles
+from rollups import record_articles
+
+logger = logging.getLogger(__name__)
+
+class ArticleWriter:
+    """Write-behind buffer that inserts extracted articles in batches"""
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = batch_size or app.config["SCRAPER_BATCH_SIZE"]
+        self.flush_interval = flush_interval or app.config["SCRAPER_FLUSH_INTERVAL"]
+        self.saved = 0
+        self.errors = []
+        self.failed_urls = []
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # The final flush always runs, even when the source run failed half-way
+        self.flush()
+        return False
+
+    def add(self, row):
+        """Queue an article row and flush when the batch is full or the interval has passed"""
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def insert_statement(self, rows):
+        """Build an insert that skips rows whose URL is already stored"""
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            stmt = postgresql.insert(Article.__table__).values(rows)
+        elif dialect == 'sqlite':
+            stmt = sqlite.insert(Article.__table__).values(rows)
+        else:
+            return None
+        columns = Article.__table__.c
+        return stmt.on_conflict_do_nothing(index_elements=['url']).returning(columns.id, columns.url, columns.scraped_date)
+
+    def flush(self):
+        """Write all queued rows in one statement and commit, row by row if that fails; return the number saved"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return 0
+
+        rows, self._pending = self._pending, []
+        try:
+            saved = self.write(rows)
+        except Exception as e:
+            db.session.rollback()
+            if len(rows) == 1:
+                self.record_failure(rows[0], e)
+                return 0
+            # One bad row fails the whole statement; save the rest one at a time
+            logger.warning(f"Error saving batch of {len(rows)} articles, retrying one by one: {str(e)}")
+            saved = []
+            for row in rows:
+                try:
+                    saved.extend(self.write([row]))
+                except Exception as e:
+                    db.session.rollback()
+                    self.record_failure(row, e)
+
+        self.saved += len(saved)
+        logger.info(f"Saved {len(saved)} of {len(rows)} articles in batch")
+
+        # Indexing runs after the commit so a failure there never loses articles
+        rows_by_url = {row['url']: row for row in rows}
+        articles = [(article_id, rows_by_url[url]['title'], rows_by_url[url].get('content'))
+                    for article_id, url, _ in saved]
+        cluster_articles(articles)
+        index_articles(articles)
+        record_articles([(scraped_date, rows_by_url[url]['source'], rows_by_url[url].get('category'))
+                         for _, url, scraped_date in saved])
+        return len(saved)
+
+    def write(self, rows):
+        """Insert rows and commit; return (id, url, scraped_date) of those saved"""
+        stmt = self.insert_statement(rows)
+        if stmt is not None:
+            saved = db.session.execute(stmt).all()
+        else:
+            saved = self.insert_one_by_one(rows)
+        db.session.commit()
+        return saved
+
+    def record_failure(self, row, error):
+        """Note an article that could not be saved, so its URL can be tried again"""
+        error_msg = f"Error saving article {row['url']}: {str(error)}"
+        logger.error(error_msg)
+        self.errors.append(error_msg)
+        self.failed_urls.append(row['url'])
+
+    def insert_one_by_one(self, rows):
+        """Fallback for databases without ON CONFLICT support"""
+        saved = []
+        for row in rows:
+            if db.session.query(Article.id).filter_by(url=row['url']).first():
+                continue
+            article = Article(**row)
+            db.session.add(article)
+            db.session.flush()
+            saved.append((article.id, article.url, article.scraped_date))
+        return saved
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the HTML parsing backends on saved article pages
+
+Usage: python bench_parsers.py [saved_page.html ...]
+Without arguments a synthetic article page is used.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from scrapers import BaseScraper, PAGE_BACKENDS, SoupPage, parse_html
+import trafilatura
+import logging
+import time
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+logging.getLogger('trafilatura').setLevel(logging.ERROR)
+logging.getLogger('htmldate').setLevel(logging.ERROR)
+
+def synthetic_page():
+    """Build a news-article-sized page with navigation, body text and images"""
+    nav = ''.join(f'<li><a href="/news/section-{i}">Section {i}</a></li>' for i in range(150))
+    paragraphs = ''.join(
+        f'<p>Paragraph {i}: the minister told parliament that the cricket match in Sylhet '
+        f'would go ahead despite the weather, according to local officials.</p>' for i in range(120)
+    )
+    return f"""<!DOCTYPE html><html><head><title>Synthetic story</title>
+<meta property="og:image" content="https://example.com/story.jpg">
+<meta property="article:section" content="Sports">
+<meta property="article:published_time" content="2026-10-05T10:00:00+06:00">
+<script>var tracking = {{"a": 1}};</script></head>
+<body><nav><ul>{nav}</ul></nav><article><h1>Synthetic story headline</h1>{paragraphs}
+<img src="/images/inline.jpg"></article><footer>{nav}</footer></body></html>"""
+
+def run_pipeline(scraper, page, html, url):
+    """Run the same extraction steps as BaseScraper.extract_article"""
+    title_tag = page.select_one('h1')
+    page.text(title_tag) if title_tag is not None else ""
+    scraper.extract_image(page, url)
+    scraper.extract_published_date(page)
+    scraper.extract_category(url, page)
+    trafilatura.extract(page.tree if page.tree is not None else html, url=url)
+
+def bench(label, make_page, pages, scraper, rounds):
+    """Time make_page + extraction over all pages; return ms per page"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for url, html in pages:
+            run_pipeline(scraper, make_page(html), html, url)
+    elapsed = time.perf_counter() - started
+    per_page = elapsed * 1000 / (rounds * len(pages))
+    logger.info(f"{label:<28} {per_page:8.2f} ms/page")
+    return per_page
+
+def main():
+    """Benchmark the old html.parser + double parse against each installed backend"""
+    pages = []
+    for path in sys.argv[1:]:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append((f"https://example.com/{os.path.basename(path)}", f.read()))
+    if not pages:
+        pages.append(("https://example.com/news/synthetic", synthetic_page()))
+
+    rounds = max(1, 50 // len(pages))
+    scraper = BaseScraper("Benchmark", "https://example.com/")
+
+    logger.info(f"{len(pages)} page(s), {rounds} round(s)")
+    # Before: html.parser tree for selectors, and trafilatura parsing the raw HTML again
+    baseline = bench("html.parser + reparse", SoupPage, pages, scraper, rounds)
+
+    for name, page_class in PAGE_BACKENDS.items():
+        if not page_class:
+            logger.info(f"{name:<28} not installed")
+            continue
+        per_page = bench(name, lambda html, name=name: parse_html(html, name), pages, scraper, rounds)
+        logger.info(f"{'':<28} {baseline / per_page:8.2f}x vs html.parser + reparse")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Throughput benchmark of the search tokenizer and of FTS5 query latency on a Bangla corpus
+
+Usage: python bench_tokenizer.py [bangla_article.txt ...]
+Without arguments a synthetic corpus is built from Bangla news vocabulary.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import random
+import sqlite3
+import logging
+import time
+from app import app
+from categories import BANGLA_KEYWORDS
+from textnorm import tokenize, index_text
+from fulltext import SQLITE_SCHEMA, TITLE_WEIGHT, fts_query
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+COMMON_WORDS = [
+    'এবং', 'থেকে', 'জন্য', 'করে', 'বলেন', 'হয়েছে', 'সালে', 'আজ', 'গতকাল', 'দিন',
+    'মানুষ', 'দেশ', 'ঢাকা', 'সিলেট', 'সুনামগঞ্জ', 'মৌলভীবাজার', 'হবিগঞ্জ', 'পুলিশ', 'উৎসব',
+    'বৃষ্টি', 'বন্যা', 'নদী', 'সড়ক', 'দুর্ঘটনা', 'প্রধানমন্ত্রী', 'জানান', 'প্রতিবেদন',
+]
+SUFFIXES = ['', '', '', 'ের', 'কে', 'রা', 'গুলো', 'টি', 'তে']
+DIGITS = '০১২৩৪৫৬৭৮৯'
+ZWNJ = '\u200c'
+
+def synthetic_corpus(count, seed=7):
+    """Build Bangla articles with inflections, Bengali digits and stray zero-width joiners"""
+    rng = random.Random(seed)
+    vocabulary = COMMON_WORDS + [word for words in BANGLA_KEYWORDS.values() for word in words]
+    articles = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(150, 400)):
+            word = rng.choice(vocabulary) + rng.choice(SUFFIXES)
+            if rng.random() < 0.05:
+                word = word[:2] + ZWNJ + word[2:]
+            if rng.random() < 0.03:
+                word = ''.join(rng.choice(DIGITS) for _ in range(4))
+            words.append(word)
+        articles.append((' '.join(words[:8]), ' '.join(words[8:])))
+    return articles
+
+def bench_tokenizer(articles, rounds=3):
+    """Report normalize + tokenize + stem throughput"""
+    size = sum(len(title.encode('utf-8')) + len(content.encode('utf-8')) for title, content in articles)
+    tokens = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for title, content in articles:
+            tokens += len(tokenize(title)) + len(tokenize(content))
+    elapsed = time.perf_counter() - started
+    logger.info(f"tokenizer: {rounds * len(articles) / elapsed:,.0f} articles/s, "
+                f"{rounds * size / elapsed / 1e6:.1f} MB/s, {tokens / elapsed:,.0f} tokens/s")
+
+def percentile(values, fraction):
+    """Value at the given fraction of a sorted list"""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def bench_queries(articles, sizes, queries=200):
+    """Report tokenize + FTS5 top-20 query latency as the corpus grows"""
+    rng = random.Random(11)
+    vocabulary = COMMON_WORDS + [word for words in BANGLA_KEYWORDS.values() for word in words]
+    for size in sizes:
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE TABLE article (id INTEGER PRIMARY KEY)")
+        for statement in SQLITE_SCHEMA:
+            conn.execute(statement)
+        conn.executemany(
+            "INSERT INTO article_fts (rowid, title, content) VALUES (?, ?, ?)",
+            ((i, index_text(title), index_text(content))
+             for i, (title, content) in enumerate(articles[i % len(articles)] for i in range(size)))
+        )
+        conn.commit()
+
+        timings = []
+        for _ in range(queries):
+            terms = ' '.join(rng.sample(vocabulary, rng.randint(1, 3)))
+            started = time.perf_counter()
+            conn.execute(
+                f"SELECT rowid FROM article_fts WHERE article_fts MATCH ? "
+                f"ORDER BY bm25(article_fts, {TITLE_WEIGHT}, 1.0) LIMIT 20",
+                (fts_query(tokenize(terms)),)
+            ).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        logger.info(f"{size:>8,} articles: query p50 {percentile(timings, 0.5):6.2f} ms, "
+                    f"p95 {percentile(timings, 0.95):6.2f} ms")
+        conn.close()
+
+def main():
+    """Benchmark tokenizer throughput, then query latency at growing corpus sizes"""
+    articles = []
+    for path in sys.argv[1:]:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        articles.append((text[:200], text))
+    if not articles:
+        articles = synthetic_corpus(2000)
+
+    logger.info(f"{len(articles)} article(s)")
+    bench_tokenizer(articles)
+    bench_queries(articles, sizes=[1000, 10000, 50000])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import re
+from urllib.parse import unquote, urlparse
+from textnorm import normalize
+
+# Category mapping for common terms
+ENGLISH_KEYWORDS = {
+    'politics': ['politics', 'political', 'government', 'election', 'minister', 'parliament'],
+    'business': ['business', 'economy', 'financial', 'trade', 'market', 'banking'],
+    'sports': ['sports', 'football', 'cricket', 'game', 'match', 'player'],
+    'entertainment': ['entertainment', 'movie', 'film', 'music', 'celebrity', 'actor'],
+    'technology': ['technology', 'tech', 'digital', 'internet', 'software', 'computer'],
+    'health': ['health', 'medical', 'hospital', 'doctor', 'disease', 'medicine'],
+    'education': ['education', 'school', 'university', 'student', 'teacher', 'academic'],
+    'international': ['international', 'world', 'global', 'foreign', 'abroad'],
+    'local': ['local', 'district', 'city', 'area', 'community', 'regional'],
+    'lifestyle': ['lifestyle', 'food', 'fashion', 'travel', 'culture', 'social']
+}
+
+# Bangla terms for the same categories, used by the Sylhet papers
+BANGLA_KEYWORDS = {
+    'politics': ['রাজনীতি', 'সরকার', 'নির্বাচন', 'মন্ত্রী', 'সংসদ', 'আওয়ামী', 'বিএনপি'],
+    'business': ['অর্থনীতি', 'বাণিজ্য', 'ব্যবসা', 'বাজার', 'ব্যাংক', 'রপ্তানি'],
+    'sports': ['খেলা', 'ক্রিকেট', 'ফুটবল', 'ম্যাচ', 'খেলোয়াড়'],
+    'entertainment': ['বিনোদন', 'চলচ্চিত্র', 'সিনেমা', 'গান', 'অভিনেতা', 'অভিনেত্রী'],
+    'technology': ['প্রযুক্তি', 'ডিজিটাল', 'ইন্টারনেট', 'সফটওয়্যার', 'কম্পিউটার'],
+    'health': ['স্বাস্থ্য', 'হাসপাতাল', 'চিকিৎসা', 'ডাক্তার', 'রোগ'],
+    'education': ['শিক্ষা', 'স্কুল', 'বিশ্ববিদ্যালয়', 'শিক্ষার্থী', 'শিক্ষক', 'পরীক্ষা'],
+    'international': ['আন্তর্জাতিক', 'বিশ্ব', 'প্রবাস', 'বিদেশ'],
+    'local': ['সিলেট', 'জেলা', 'উপজেলা', 'স্থানীয়', 'সিটি করপোরেশন'],
+    'lifestyle': ['জীবনযাপন', 'খাবার', 'ফ্যাশন', 'ভ্রমণ', 'সংস্কৃতি']
+}
+
+def merge_keywords(*tables):
+    """Combine keyword tables category by category"""
+    merged = {}
+    for table in tables:
+        for category, keywords in table.items():
+            merged.setdefault(category, []).extend(keywords)
+    return merged
+
+class CategoryClassifier:
+    """Keyword classifier backed by a single compiled regex alternation"""
+
+    def __init__(self, keywords, min_hits=2):
+        self.min_hits = min_hits
+        self.order = list(keywords)
+        self.categories = {}
+        for category, terms in keywords.items():
+            for term in terms:
+                # Same folding as the text, so composed/decomposed and ZWJ spellings all match
+                self.categories.setdefault(normalize(term), category)
+
+        # Longest terms first so 'technology' wins over 'tech'; a term must not start mid-word
+        alternation = '|'.join(re.escape(term) for term in sorted(self.categories, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<![a-z\u0980-\u09ff])(?:{alternation})", re.IGNORECASE)
+
+    def from_url(self, url):
+        """Return the category of the first keyword in the URL path, or None"""
+        path = normalize(unquote(urlparse(url).path))
+        match = self.pattern.search(path)
+        return self.categories[match.group(0)] if match else None
+
+    def from_text(self, text):
+        """Return the category with the most distinct keyword hits (at least min_hits), or None"""
+        if not text:
+            return None
+
+        hits = {}
+        for term in set(self.pattern.findall(normalize(text))):
+            category = self.categories[term]
+            hits[category] = hits.get(category, 0) + 1
+
+        best = None
+        for category in self.order:
+            if hits.get(category, 0) >= self.min_hits and (best is None or hits[category] > hits[best]):
+                best = category
+        return best
+
+# Compiled once at import and shared by every scraper
+ENGLISH_CLASSIFIER = CategoryClassifier(ENGLISH_KEYWORDS)
+BANGLA_CLASSIFIER = CategoryClassifier(merge_keywords(ENGLISH_KEYWORDS, BANGLA_KEYWORDS))
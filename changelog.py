@@ -0,0 +1,99 @@
+import zlib
+import logging
+from sqlalchemy import text, func
+from app import db
+from models import Article, ArticleChange
+
+logger = logging.getLogger(__name__)
+
+# Changes recorded for downstream consumers
+ADDED = 'added'
+DEACTIVATED = 'deactivated'
+DELETED = 'deleted'
+
+# Triggers keep the log complete whatever writes to the article table: the
+# batched writer, the cleanup job or manual SQL. Reactivating an article is
+# logged as added again.
+SQLITE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS article_change_insert AFTER INSERT ON article BEGIN
+        INSERT INTO article_change (article_id, change, changed_at) VALUES (new.id, 'added', CURRENT_TIMESTAMP);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_change_deactivate AFTER UPDATE OF is_active ON article
+    WHEN COALESCE(old.is_active, 1) AND NOT COALESCE(new.is_active, 1) BEGIN
+        INSERT INTO article_change (article_id, change, changed_at) VALUES (new.id, 'deactivated', CURRENT_TIMESTAMP);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_change_reactivate AFTER UPDATE OF is_active ON article
+    WHEN NOT COALESCE(old.is_active, 1) AND COALESCE(new.is_active, 1) BEGIN
+        INSERT INTO article_change (article_id, change, changed_at) VALUES (new.id, 'added', CURRENT_TIMESTAMP);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_change_delete AFTER DELETE ON article BEGIN
+        INSERT INTO article_change (article_id, change, changed_at) VALUES (old.id, 'deleted', CURRENT_TIMESTAMP);
+    END""",
+]
+
+# Postgres hands out seq values in insert order but transactions commit in any
+# order, so a reader could see seq 11 committed while 10 is still in flight and
+# move its cursor past 10 for good. Each writer takes this transaction-scoped
+# lock before its first seq and holds it until commit, so seqs become visible in
+# order. SQLite already allows only one writer at a time.
+CHANGE_LOG_LOCK = zlib.crc32(b'article_change')
+
+POSTGRES_TRIGGERS = [
+    f"""CREATE OR REPLACE FUNCTION record_article_change() RETURNS trigger AS $$
+    DECLARE
+        kind text;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            kind := 'added';
+        ELSIF TG_OP = 'DELETE' THEN
+            kind := 'deleted';
+        ELSIF COALESCE(OLD.is_active, true) AND NOT COALESCE(NEW.is_active, true) THEN
+            kind := 'deactivated';
+        ELSIF NOT COALESCE(OLD.is_active, true) AND COALESCE(NEW.is_active, true) THEN
+            kind := 'added';
+        END IF;
+        IF kind IS NOT NULL THEN
+            PERFORM pg_advisory_xact_lock({CHANGE_LOG_LOCK});
+            INSERT INTO article_change (article_id, change, changed_at)
+            VALUES (CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END, kind, now());
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS article_change_trigger ON article",
+    """CREATE TRIGGER article_change_trigger AFTER INSERT OR UPDATE OF is_active OR DELETE ON article
+    FOR EACH ROW EXECUTE PROCEDURE record_article_change()""",
+]
+
+# Articles stored before the log existed count as added, in id order
+BACKFILL = """INSERT INTO article_change (article_id, change, changed_at)
+    SELECT id, 'added', COALESCE(scraped_date, CURRENT_TIMESTAMP) FROM article
+    WHERE is_active AND NOT EXISTS (SELECT 1 FROM article_change)
+    ORDER BY id"""
+
+def create_triggers():
+    """Install the change-log triggers and seed the log; run by the schema migrations"""
+    triggers = {'sqlite': SQLITE_TRIGGERS, 'postgresql': POSTGRES_TRIGGERS}.get(db.engine.dialect.name)
+    if triggers is None:
+        logger.warning("Article change log triggers are not available for this database")
+        return
+    db.session.execute(text(BACKFILL))
+    for statement in triggers:
+        db.session.execute(text(statement))
+
+def change_window(since, limit=None):
+    """Return the last sequence number to send after `since`, at most `limit` changes ahead"""
+    query = db.session.query(ArticleChange.seq).filter(ArticleChange.seq > since)
+    if limit:
+        last = query.order_by(ArticleChange.seq).offset(limit - 1).limit(1).scalar()
+        if last is not None:
+            return last
+    return db.session.query(func.max(ArticleChange.seq)).filter(ArticleChange.seq > since).scalar() or since
+
+def changes_query(columns, since, upto):
+    """Changes in (since, upto] in order, each with the article columns when the article still exists"""
+    return db.session.query(
+        ArticleChange.seq, ArticleChange.change, ArticleChange.article_id, *columns
+    ).outerjoin(Article, Article.id == ArticleChange.article_id).filter(
+        ArticleChange.seq > since, ArticleChange.seq <= upto
+    ).order_by(ArticleChange.seq)
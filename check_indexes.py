@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Check with EXPLAIN that the route and retention queries use the composite indexes
+
+Usage: python check_indexes.py   (exits with status 1 if a query misses its index)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from app import app, db
+from models import Article, ScrapingLog, DailyArticleCount
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+def route_queries():
+    """(label, acceptable indexes, query) for each hot query, built as the routes build them"""
+    since = datetime.utcnow() - timedelta(days=30)
+    active = Article.query.filter_by(is_active=True)
+    newest_first = (Article.scraped_date.desc(), Article.id.desc())
+    return [
+        ("index: latest articles", 'ix_article_active_scraped',
+         active.order_by(*newest_first).limit(11)),
+        ("index: page after a cursor", 'ix_article_active_scraped',
+         active.filter(tuple_(Article.scraped_date, Article.id) < tuple_(since, 1000)).order_by(*newest_first).limit(11)),
+        ("index: filtered by source", 'ix_article_source_active_scraped',
+         active.filter(Article.source == 'The Daily Star').order_by(*newest_first).limit(11)),
+        ("index: filtered by category", 'ix_article_category_active_scraped',
+         active.filter(Article.category == 'sports').order_by(*newest_first).limit(11)),
+        ("index: active article count", 'ix_article_active_scraped',
+         db.session.query(db.func.count(Article.id)).filter(Article.is_active == True)),
+        ("index: recent scrapes", 'ix_scraping_log_timestamp',
+         ScrapingLog.query.order_by(ScrapingLog.timestamp.desc()).limit(10)),
+        # The rollup primary key leads with the day, so any window is a range scan
+        ("stats: articles per day", ('daily_article_count_pkey', 'sqlite_autoindex_daily_article_count_1'),
+         db.session.query(DailyArticleCount.day, db.func.sum(DailyArticleCount.count))
+         .filter(DailyArticleCount.day >= since.date()).group_by(DailyArticleCount.day)),
+        ("scheduler: recent yield per source", 'ix_scraping_log_timestamp',
+         db.session.query(ScrapingLog.source, db.func.sum(ScrapingLog.articles_saved),
+                          db.func.min(ScrapingLog.timestamp), db.func.max(ScrapingLog.timestamp))
+         .filter(ScrapingLog.timestamp >= since).group_by(ScrapingLog.source)),
+        ("retention: oldest expired batch", 'ix_article_scraped_date',
+         db.session.query(Article.id).filter(Article.scraped_date < since)
+         .order_by(Article.scraped_date).limit(1000)),
+        ("retention: expired batch for one source", ('ix_article_source_active_scraped', 'ix_article_scraped_date'),
+         db.session.query(Article.id).filter(Article.scraped_date < since, Article.source == 'Daily Sylhet')
+         .order_by(Article.scraped_date).limit(1000)),
+    ]
+
+def explain(query):
+    """Return the query plan lines for a query"""
+    sql = str(query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+    connection = db.session.connection()
+    if db.engine.dialect.name == 'sqlite':
+        return [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    return [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}")]
+
+def main():
+    """Print each query's plan and whether it uses the expected index"""
+    failures = 0
+    with app.app_context():
+        if db.engine.dialect.name == 'postgresql':
+            # On small tables Postgres rightly prefers a sequential scan; rule that out
+            # so the plan shows which index it would pick once the table is large
+            db.session.connection().exec_driver_sql("SET enable_seqscan = off")
+
+        for label, index_names, query in route_queries():
+            if isinstance(index_names, str):
+                index_names = (index_names,)
+            plan = explain(query)
+            used = any(name in line for name in index_names for line in plan)
+            failures += 0 if used else 1
+            logger.info(f"{'OK  ' if used else 'MISS'} {label} -> {' or '.join(index_names)}")
+            for line in plan:
+                logger.info(f"       {line}")
+        db.session.rollback()
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
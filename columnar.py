@@ -0,0 +1,168 @@
+import io
+import logging
+from app import app
+from models import Article
+from exports import export_query
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Article columns written to columnar files; content is optional as it dwarfs the rest
+COLUMNS = [
+    Article.id, Article.title, Article.summary, Article.url, Article.source, Article.category,
+    Article.published_date, Article.scraped_date, Article.author, Article.image_url, Article.is_active,
+]
+
+# Low-cardinality strings are dictionary-encoded so they load as categoricals
+CATEGORICAL = ('source', 'category')
+
+def available():
+    """True when pyarrow is installed"""
+    return pa is not None
+
+def arrow_schema(with_content=False):
+    """Typed schema: timestamps stay timestamps and source/category are dictionaries"""
+    category = pa.dictionary(pa.int32(), pa.string())
+    fields = [
+        pa.field('id', pa.int64(), nullable=False),
+        pa.field('title', pa.string()),
+        pa.field('summary', pa.string()),
+        pa.field('url', pa.string()),
+        pa.field('source', category),
+        pa.field('category', category),
+        pa.field('published_date', pa.timestamp('us')),
+        pa.field('scraped_date', pa.timestamp('us')),
+        pa.field('author', pa.string()),
+        pa.field('image_url', pa.string()),
+        pa.field('is_active', pa.bool_()),
+    ]
+    if with_content:
+        fields.insert(2, pa.field('content', pa.string()))
+    return pa.schema(fields)
+
+def columnar_query(with_content=False, collapse=False):
+    """Export query for the columnar formats"""
+    columns = list(COLUMNS)
+    if with_content:
+        columns.insert(2, Article.content)
+    return export_query(columns, collapse)
+
+class CategoryDictionary:
+    """Values of one dictionary column seen so far, shared by every batch of a file
+
+    Each batch only appends to the dictionary, so the writer sends the new values
+    as a delta; the Arrow file format rejects a dictionary replaced mid-file.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.positions = {}
+
+    def encode(self, values):
+        """Dictionary array of values against everything seen so far"""
+        indices = []
+        for value in values:
+            if value is not None and value not in self.positions:
+                self.positions[value] = len(self.values)
+                self.values.append(value)
+            indices.append(None if value is None else self.positions[value])
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(self.values, pa.string()))
+
+def record_batches(query, schema, batch_rows):
+    """Turn query rows into Arrow record batches of at most batch_rows rows"""
+    names = schema.names
+    dictionaries = {name: CategoryDictionary() for name in CATEGORICAL}
+    columns = {name: [] for name in names}
+    for row in query:
+        for name in names:
+            columns[name].append(getattr(row, name))
+        if len(columns['id']) >= batch_rows:
+            yield to_batch(columns, schema, dictionaries)
+            columns = {name: [] for name in names}
+    if columns['id']:
+        yield to_batch(columns, schema, dictionaries)
+
+def to_batch(columns, schema, dictionaries):
+    """Build one record batch from column lists"""
+    arrays = []
+    for field in schema:
+        if field.name in CATEGORICAL:
+            arrays.append(dictionaries[field.name].encode(columns[field.name]))
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class StreamSink(io.RawIOBase):
+    """Write-only file that keeps what was written until drained, for streaming responses"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        """Return and forget everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def open_writer(sink, schema, file_format):
+    """Parquet (zstd, one row group per batch) or Arrow IPC file (Feather v2) writer"""
+    if file_format == 'arrow':
+        return pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+    return pq.ParquetWriter(sink, schema, compression='zstd')
+
+def write_batches(writer, batches, file_format):
+    """Write each batch; for Parquet each batch becomes one row group"""
+    for batch in batches:
+        if file_format == 'arrow':
+            writer.write_batch(batch)
+        else:
+            writer.write_table(pa.Table.from_batches([batch]))
+        yield len(batch)
+
+def columnar_chunks(file_format, with_content=False, collapse=False):
+    """Stream a Parquet or Arrow file as bytes, one row group at a time"""
+    schema = arrow_schema(with_content)
+    query = columnar_query(with_content, collapse)
+    batches = record_batches(query, schema, app.config["EXPORT_ROW_GROUP_SIZE"])
+
+    sink = StreamSink()
+    writer = open_writer(pa.PythonFile(sink, mode='w'), schema, file_format)
+    for _ in write_batches(writer, batches, file_format):
+        yield sink.drain()
+    # The footer is written on close
+    writer.close()
+    yield sink.drain()
+
+def write_snapshot(path, file_format='parquet', with_content=False, collapse=False):
+    """Write every active article to a Parquet or Arrow file; return the number of rows"""
+    schema = arrow_schema(with_content)
+    query = columnar_query(with_content, collapse)
+    batches = record_batches(query, schema, app.config["EXPORT_ROW_GROUP_SIZE"])
+
+    writer = open_writer(path, schema, file_format)
+    try:
+        rows = sum(write_batches(writer, batches, file_format))
+    finally:
+        writer.close()
+    return rows
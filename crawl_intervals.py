@@ -0,0 +1,44 @@
+import logging
+from datetime import datetime, timedelta
+from app import app, db
+from models import ScrapingLog
+
+logger = logging.getLogger(__name__)
+
+def source_history(since):
+    """{source: (articles saved, first crawl, last crawl)} from the scraping log since a time"""
+    rows = db.session.query(
+        ScrapingLog.source,
+        db.func.sum(ScrapingLog.articles_saved),
+        db.func.min(ScrapingLog.timestamp),
+        db.func.max(ScrapingLog.timestamp),
+    ).filter(ScrapingLog.timestamp >= since).group_by(ScrapingLog.source)
+    return {source: (saved or 0, first, last) for source, saved, first, last in rows}
+
+def yield_interval(saved, observed_seconds):
+    """Seconds between crawls that should each find about SCRAPER_TARGET_YIELD new articles"""
+    low, high = app.config["SCRAPER_MIN_INTERVAL"], app.config["SCRAPER_MAX_INTERVAL"]
+    if saved <= 0:
+        return high
+    per_second = saved / observed_seconds
+    return int(min(high, max(low, app.config["SCRAPER_TARGET_YIELD"] / per_second)))
+
+def crawl_plan(sources, now=None):
+    """{source: (interval in seconds, next due time)} for each source name"""
+    now = now or datetime.utcnow()
+    history = source_history(now - timedelta(days=app.config["SCRAPER_YIELD_WINDOW_DAYS"]))
+    default = app.config["SCRAPER_DEFAULT_INTERVAL"]
+
+    plan = {}
+    for source in sources:
+        if source not in history:
+            # No recent crawls: crawl now, then at the default pace
+            plan[source] = (default, now)
+            continue
+        saved, first, last = history[source]
+        # Short histories are spread over at least the default interval so one
+        # large first crawl does not look like a very busy source
+        observed = max((now - first).total_seconds(), default)
+        interval = yield_interval(saved, observed)
+        plan[source] = (interval, last + timedelta(seconds=interval))
+    return plan
@@ -0,0 +1,102 @@
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app import app, db
+from models import Article
+from urlcanon import canonicalize_url
+from http_cache import listing_cache
+from facets import rebuild_facets
+
+logger = logging.getLogger(__name__)
+
+class SeenUrlIndex:
+    """Thread-safe in-memory set of canonical article URLs that are stored or being fetched"""
+
+    def __init__(self, urls=()):
+        self._urls = set(urls)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls):
+        """Build the index from the article.url column, keyed by canonical URL"""
+        return cls(canonicalize_url(url) or url for (url,) in db.session.query(Article.url))
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._urls
+
+    def __len__(self):
+        with self._lock:
+            return len(self._urls)
+
+    def add(self, url):
+        """Add a URL; return False if it was already present"""
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            return True
+
+    def discard(self, url):
+        """Forget a URL, e.g. after a failed fetch so a later run can retry it"""
+        with self._lock:
+            self._urls.discard(url)
+
+class CrawlEngine:
+    """Run several scrapers at once, each in its own thread and app context"""
+
+    def __init__(self, max_workers=None, mode='incremental'):
+        self.max_workers = max_workers or app.config["SCRAPER_MAX_WORKERS"]
+        self.mode = mode
+
+    def run_source(self, scraper):
+        """Run a single scraper inside its own application context"""
+        with app.app_context():
+            logger.info(f"Starting scraper for {scraper.source_name}")
+            return scraper.scrape_articles(mode=self.mode)
+
+    def run(self, scrapers, progress=None):
+        """Run all scrapers concurrently and return (found, saved, errors) totals"""
+        total_found = 0
+        total_saved = 0
+        all_errors = []
+        done = 0
+
+        # One index for the whole run so sources never fetch a URL another source already has
+        with app.app_context():
+            seen_urls = SeenUrlIndex.load()
+        logger.info(f"Loaded {len(seen_urls)} known article URLs")
+        for scraper in scrapers:
+            scraper.seen_urls = seen_urls
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as pool:
+            futures = {pool.submit(self.run_source, scraper): scraper for scraper in scrapers}
+
+            for future in as_completed(futures):
+                scraper = futures[future]
+                try:
+                    found, saved, errors = future.result()
+                except Exception as e:
+                    error_msg = f"Error scraping {scraper.source_name}: {str(e)}"
+                    logger.error(error_msg)
+                    found, saved, errors = 0, 0, [error_msg]
+
+                total_found += found
+                total_saved += saved
+                all_errors.extend(errors)
+                logger.info(f"Completed {scraper.source_name}: {found} found, {saved} saved")
+                done += 1
+                # Sources finished, sources in the run, and totals so far
+                if progress:
+                    progress(done, len(scrapers), total_found, total_saved)
+
+        # Dropdown counts on the index page change only when a scrape saved something
+        if total_saved:
+            with app.app_context():
+                rebuild_facets()
+
+        listing_cache.evict()
+        stats = listing_cache.stats
+        logger.info(f"Listing cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
+        logger.info(f"Total scraping completed: {total_found} found, {total_saved} saved")
+        return total_found, total_saved, all_errors
@@ -0,0 +1,158 @@
+import io
+import os
+import re
+import json
+import time
+import threading
+import logging
+from collections import namedtuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from lxml import etree
+from app import app
+
+logger = logging.getLogger(__name__)
+
+# An article link found in a feed or sitemap, with its publish date when given
+DiscoveredLink = namedtuple('DiscoveredLink', ['url', 'published'])
+
+# Feed and sitemap locations tried, in order, for sources without explicit ones
+FEED_CANDIDATES = ['feed/', 'rss.xml', 'news-sitemap.xml', 'sitemap_news.xml', 'sitemap.xml']
+
+# Documents whose root is one of these are parsed as feeds rather than HTML
+FEED_ROOTS = ('rss', 'feed', 'rdf', 'urlset', 'sitemapindex')
+
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+ROOT_TAG = re.compile(r'<(?!\?|!)([\w:.-]+)')
+
+def parse_datetime(value):
+    """Parse an ISO 8601 or RFC 822 date into a naive UTC datetime"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def local_name(tag):
+    """Strip the namespace from an element tag"""
+    return tag.rsplit('}', 1)[-1].lower() if isinstance(tag, str) else ''
+
+def feed_root(body):
+    """Return the root element name if a document is an RSS/Atom feed or sitemap, else None"""
+    if not body:
+        return None
+    match = ROOT_TAG.search(XML_DECLARATION.sub('', body[:2048]))
+    if match:
+        root = match.group(1).split(':')[-1].lower()
+        if root in FEED_ROOTS:
+            return root
+    return None
+
+def child_text(element, *names):
+    """Return the text of the first direct child with one of the given local names"""
+    for child in element:
+        if local_name(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+def parse_feed(body):
+    """Stream-parse an RSS/Atom feed or sitemap; return (links, child sitemap URLs newest first)"""
+    links = []
+    sitemaps = []
+    data = io.BytesIO(XML_DECLARATION.sub('', body, count=1).encode('utf-8'))
+    parser = etree.iterparse(data, events=('end',), resolve_entities=False, no_network=True,
+                             recover=True, huge_tree=False)
+
+    try:
+        for _, element in parser:
+            name = local_name(element.tag)
+            if name == 'item':
+                # RSS 2.0 / RDF item
+                url = child_text(element, 'link') or child_text(element, 'guid')
+                published = child_text(element, 'pubdate', 'date')
+                links.append(DiscoveredLink(url, parse_datetime(published)))
+            elif name == 'entry':
+                # Atom entry: prefer the alternate link
+                url = None
+                for child in element:
+                    if local_name(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                        url = child.get('href')
+                        break
+                published = child_text(element, 'published', 'updated')
+                links.append(DiscoveredLink(url, parse_datetime(published)))
+            elif name == 'url':
+                # Sitemap entry, with a Google News publication date when present
+                published = None
+                for child in element.iter():
+                    if local_name(child.tag) == 'publication_date' and child.text:
+                        published = child.text
+                        break
+                links.append(DiscoveredLink(child_text(element, 'loc'),
+                                            parse_datetime(published or child_text(element, 'lastmod'))))
+            elif name == 'sitemap':
+                loc = child_text(element, 'loc')
+                if loc:
+                    sitemaps.append((loc, parse_datetime(child_text(element, 'lastmod'))))
+            else:
+                continue
+            # Finished entries are dropped so memory stays flat on large sitemaps
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        logger.warning(f"Error parsing feed: {str(e)}")
+
+    # Sitemap indexes usually list the oldest archives first; undated ones keep their order, last
+    sitemaps.sort(key=lambda sitemap: sitemap[1] or datetime.min, reverse=True)
+    return [link for link in links if link.url], [loc for loc, _ in sitemaps]
+
+class FeedDirectory:
+    """Remembers which feed (or none) each source offers, so probing happens once a day"""
+
+    def __init__(self, path, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._feeds = self.load()
+
+    def load(self):
+        """Read the saved directory; a missing or broken file just means probing again"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def lookup(self, source_name):
+        """Return (known, feed_url) for a source"""
+        with self._lock:
+            entry = self._feeds.get(source_name)
+        if entry and time.time() - entry['checked_at'] < self.ttl:
+            return True, entry['feed_url']
+        return False, None
+
+    def remember(self, source_name, feed_url):
+        """Record the feed found for a source, or None when it has none"""
+        with self._lock:
+            self._feeds[source_name] = {'feed_url': feed_url, 'checked_at': time.time()}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._feeds, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Error saving feed directory: {str(e)}")
+
+feed_directory = FeedDirectory(
+    path=app.config["FEED_DIRECTORY_FILE"],
+    ttl=app.config["FEED_DIRECTORY_TTL"],
+)
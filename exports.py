@@ -0,0 +1,155 @@
+import io
+import csv
+import json
+import zlib
+import logging
+from datetime import datetime
+from flask import Response, stream_with_context
+from app import app, db
+from models import Article
+from fingerprints import collapse_duplicates
+
+logger = logging.getLogger(__name__)
+
+CSV_HEADER = ['ID', 'Title', 'Source', 'URL', 'Published Date', 'Scraped Date', 'Author', 'Category', 'Summary']
+
+# Only the columns each format writes are loaded; the CSV never reads content
+CSV_COLUMNS = [
+    Article.id, Article.title, Article.source, Article.url, Article.published_date,
+    Article.scraped_date, Article.author, Article.category, Article.summary,
+]
+JSON_COLUMNS = [
+    Article.id, Article.title, Article.content, Article.summary, Article.url, Article.source,
+    Article.published_date, Article.scraped_date, Article.author, Article.category,
+    Article.image_url, Article.is_active,
+]
+
+# Output is sent in pieces of about this many characters
+CHUNK_SIZE = 64 * 1024
+
+def export_query(columns, collapse=False):
+    """Active articles, newest first, fetched in batches through a streaming cursor"""
+    query = db.session.query(*columns).filter(Article.is_active == True)
+    if collapse:
+        query = collapse_duplicates(query)
+    return query.order_by(Article.scraped_date.desc(), Article.id.desc()).yield_per(
+        app.config["EXPORT_BATCH_SIZE"]
+    )
+
+def row_dict(row):
+    """Same fields and formatting as Article.to_dict for a column row"""
+    return {key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row._mapping.items()}
+
+def format_date(value):
+    """CSV date format"""
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+def buffered(pieces):
+    """Join small strings into chunks of about CHUNK_SIZE characters"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+def logged(pieces, label):
+    """Pass pieces through, logging an error that ends the stream early"""
+    try:
+        yield from pieces
+    except Exception as e:
+        logger.error(f"Error streaming {label} export: {str(e)}")
+        # Re-raised so the server drops the connection instead of finishing a
+        # well-formed (and gzip-complete) body the client would take as whole
+        raise
+
+def csv_fields(row):
+    """CSV values of an article row, in CSV_HEADER order"""
+    return [
+        row.id,
+        row.title,
+        row.source,
+        row.url,
+        format_date(row.published_date),
+        format_date(row.scraped_date),
+        row.author or '',
+        row.category or '',
+        row.summary or '',
+    ]
+
+def csv_lines(query, header=CSV_HEADER, fields=csv_fields):
+    """CSV header and one line per row"""
+    line = io.StringIO()
+    writer = csv.writer(line)
+    writer.writerow(header)
+    for row in query:
+        writer.writerow(fields(row))
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+    # Header only, for an empty export
+    if line.tell():
+        yield line.getvalue()
+
+def json_document(query, key='articles', to_dict=row_dict, **fields):
+    """A JSON document with the rows array written one row at a time"""
+    header = {'export_date': datetime.now().isoformat(), **fields}
+    yield json.dumps(header, ensure_ascii=False)[:-1] + f', "{key}": ['
+    count = 0
+    for row in query:
+        yield (',\n' if count else '\n') + json.dumps(to_dict(row), ensure_ascii=False)
+        count += 1
+    # The total is only known at the end of the stream
+    yield f'\n], "total_{key}": {count}}}\n'
+
+def ndjson_lines(query, to_dict=row_dict):
+    """One JSON object per line"""
+    for row in query:
+        yield json.dumps(to_dict(row), ensure_ascii=False) + '\n'
+
+CHANGE_CSV_HEADER = ['Seq', 'Change'] + CSV_HEADER
+
+def change_dict(row):
+    """A change log row as JSON: seq, change, id, and the article itself for additions"""
+    data = row_dict(row)
+    change = {'seq': data.pop('seq'), 'change': data.pop('change'), 'id': data.pop('article_id')}
+    # Articles deleted since are sent only as their later 'deleted' change
+    if change['change'] == 'added' and data.get('title') is not None:
+        data.pop('id')
+        change['article'] = data
+    return change
+
+def change_csv_fields(row):
+    """CSV values of a change log row; article fields stay empty unless it was an addition"""
+    if row.change == 'added' and row.title is not None:
+        return [row.seq, row.change] + csv_fields(row)
+    return [row.seq, row.change, row.article_id] + [''] * (len(CSV_HEADER) - 1)
+
+def gzipped(chunks):
+    """Compress a stream of text chunks into a gzip stream"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_response(pieces, label, extension, mimetype, compress=False, headers=None):
+    """Stream an export as a file download, gzip-compressed on the fly when asked"""
+    chunks = buffered(logged(pieces, label))
+    filename = f'sylheti_news_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+    if compress:
+        chunks = gzipped(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    response.headers.update(headers or {})
+    return response
@@ -0,0 +1,52 @@
+import logging
+from datetime import datetime
+from app import db
+from models import Article, FacetCount
+
+logger = logging.getLogger(__name__)
+
+# Facet rows: one per source, one per category, and the total of active articles
+SOURCE = 'source'
+CATEGORY = 'category'
+TOTAL = 'total'
+
+def rebuild_facets():
+    """Recount active articles per source and category; readers keep the old counts until commit"""
+    try:
+        now = datetime.utcnow()
+        active = Article.is_active == True
+        rows = [FacetCount(facet=TOTAL, value='', updated_at=now,
+                           count=db.session.query(db.func.count(Article.id)).filter(active).scalar())]
+        for facet, column in ((SOURCE, Article.source), (CATEGORY, Article.category)):
+            for value, count in db.session.query(column, db.func.count(Article.id)).filter(
+                active, column.isnot(None), column != ''
+            ).group_by(column):
+                rows.append(FacetCount(facet=facet, value=value, count=count, updated_at=now))
+
+        db.session.query(FacetCount).delete()
+        db.session.add_all(rows)
+        db.session.commit()
+        logger.info(f"Rebuilt facet counts: {len(rows) - 1} sources and categories")
+    except Exception as e:
+        logger.error(f"Error rebuilding facet counts: {str(e)}")
+        db.session.rollback()
+
+def load_facets():
+    """Return {'sources': [(name, count)], 'categories': [(name, count)], 'total': n} from the cache table"""
+    rows = FacetCount.query.all()
+    if not rows:
+        # First start, or the table was emptied: build it once
+        rebuild_facets()
+        rows = FacetCount.query.all()
+
+    facets = {'sources': [], 'categories': [], 'total': 0}
+    for row in rows:
+        if row.facet == TOTAL:
+            facets['total'] = row.count
+        elif row.facet == SOURCE:
+            facets['sources'].append((row.value, row.count))
+        elif row.facet == CATEGORY:
+            facets['categories'].append((row.value, row.count))
+    facets['sources'].sort()
+    facets['categories'].sort()
+    return facets
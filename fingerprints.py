@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Near-duplicate detection: 64-bit SimHash fingerprints clustered through LSH bands
+
+Usage: python fingerprints.py   (fingerprint articles saved before the index existed)
+"""
+
+import hashlib
+import logging
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.orm import aliased
+from app import app, db
+from models import Article, ArticleFingerprint
+from textnorm import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Two fingerprints this many bits apart or fewer are the same story. With four
+# 16-bit bands, any such pair is guaranteed to share at least one band exactly.
+MAX_DISTANCE = 3
+BANDS = 4
+BAND_BITS = 16
+SHINGLE_SIZE = 3
+
+# Too few shingles give unstable fingerprints that collide with unrelated stories
+MIN_SHINGLES = 8
+MAX_TOKENS = 2000
+
+# Upper bound on candidates compared per insert, so clustering stays constant time
+# even when a band value turns out to be very common
+MAX_CANDIDATES = 64
+
+def shingles(text):
+    """Return the set of overlapping word triples in a text"""
+    tokens = tokenize(text, stemming=False)[:MAX_TOKENS]
+    if len(tokens) < SHINGLE_SIZE:
+        return set()
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+def simhash(text):
+    """Return the 64-bit SimHash of a text, or None when it is too short to fingerprint"""
+    features = shingles(text or '')
+    if len(features) < MIN_SHINGLES:
+        return None
+
+    weights = [0] * 64
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming(a, b):
+    """Number of differing bits between two fingerprints"""
+    return bin((a ^ b) & 0xFFFFFFFFFFFFFFFF).count('1')
+
+def bands(fingerprint):
+    """Split a fingerprint into its LSH band values"""
+    mask = (1 << BAND_BITS) - 1
+    return [fingerprint >> (i * BAND_BITS) & mask for i in range(BANDS)]
+
+def to_signed(fingerprint):
+    """Fold an unsigned 64-bit fingerprint into the range of a signed BIGINT column"""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+def fingerprint_article(article_id, title, content):
+    """Fingerprint one saved article and attach it to the cluster of its closest match"""
+    fingerprint = simhash(f"{title or ''}\n{content or ''}")
+    if fingerprint is None:
+        return None
+
+    band_values = bands(fingerprint)
+    candidates = db.session.query(
+        ArticleFingerprint.simhash, ArticleFingerprint.cluster_id
+    ).filter(or_(
+        ArticleFingerprint.band0 == band_values[0],
+        ArticleFingerprint.band1 == band_values[1],
+        ArticleFingerprint.band2 == band_values[2],
+        ArticleFingerprint.band3 == band_values[3],
+    )).limit(MAX_CANDIDATES).all()
+
+    cluster_id = article_id
+    best = MAX_DISTANCE + 1
+    for candidate_hash, candidate_cluster in candidates:
+        distance = hamming(candidate_hash, fingerprint)
+        if distance < best:
+            best, cluster_id = distance, candidate_cluster
+
+    db.session.add(ArticleFingerprint(
+        article_id=article_id,
+        simhash=to_signed(fingerprint),
+        band0=band_values[0],
+        band1=band_values[1],
+        band2=band_values[2],
+        band3=band_values[3],
+        cluster_id=cluster_id,
+    ))
+    # Flush so later articles of the same batch can match this one
+    db.session.flush()
+    return cluster_id
+
+def cluster_articles(articles):
+    """Fingerprint (id, title, content) tuples and commit; return how many were indexed"""
+    indexed = 0
+    clusters = set()
+    try:
+        for article_id, title, content in articles:
+            cluster_id = fingerprint_article(article_id, title, content)
+            if cluster_id is not None:
+                clusters.add(cluster_id)
+                indexed += 1
+        elect_representatives(clusters)
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error fingerprinting articles: {str(e)}")
+        db.session.rollback()
+        return 0
+    return indexed
+
+def elect_representatives(cluster_ids=None):
+    """Flag the earliest active article of each given cluster (all when None), overall and per source
+
+    Run when articles are fingerprinted or expired, so collapsed listings filter
+    on the flags instead of ranking every cluster member on each query.
+    """
+    if cluster_ids is not None and not cluster_ids:
+        return
+    member = aliased(ArticleFingerprint)
+    member_article = aliased(Article)
+    # Both subqueries are evaluated for the fingerprint row being updated
+    own_source = select(Article.source).where(
+        Article.id == ArticleFingerprint.article_id
+    ).correlate(ArticleFingerprint).scalar_subquery()
+    first = select(func.min(member.article_id)).join(member_article, member_article.id == member.article_id).where(
+        member.cluster_id == ArticleFingerprint.cluster_id,
+        member_article.is_active == True,
+    ).correlate(ArticleFingerprint)
+    first_of_source = first.where(member_article.source == own_source)
+
+    stmt = update(ArticleFingerprint).values(
+        representative=func.coalesce(ArticleFingerprint.article_id == first.scalar_subquery(), False),
+        source_representative=func.coalesce(ArticleFingerprint.article_id == first_of_source.scalar_subquery(), False),
+    )
+    if cluster_ids is not None:
+        stmt = stmt.where(ArticleFingerprint.cluster_id.in_(sorted(cluster_ids)))
+    db.session.execute(stmt)
+
+def clusters_of(article_ids):
+    """Clusters the given articles belong to"""
+    return {cluster_id for cluster_id, in db.session.query(ArticleFingerprint.cluster_id).filter(
+        ArticleFingerprint.article_id.in_(article_ids)
+    ).distinct()}
+
+def collapse_duplicates(query, scope='all'):
+    """Restrict an Article query to one article per near-duplicate cluster
+
+    scope 'all' keeps each cluster's representative and 'source' the one of each
+    source, both read from flags set when articles are fingerprinted. 'filtered'
+    ranks the rows the query matches, for filters (category, search) under which
+    the stored representative may be hidden; that costs a pass over the matches.
+    """
+    own = aliased(ArticleFingerprint)
+    if scope != 'filtered':
+        flag = own.source_representative if scope == 'source' else own.representative
+        # Articles without a fingerprint are clusters of their own
+        return query.outerjoin(own, own.article_id == Article.id).filter(or_(own.article_id.is_(None), flag == True))
+
+    ranked = query.order_by(None).outerjoin(own, own.article_id == Article.id).with_entities(
+        Article.id.label('article_id'),
+        func.row_number().over(
+            partition_by=func.coalesce(own.cluster_id, -Article.id),
+            order_by=Article.id,
+        ).label('position'),
+    ).subquery()
+    return query.filter(Article.id.in_(select(ranked.c.article_id).where(ranked.c.position == 1)))
+
+def backfill(batch_size=500):
+    """Fingerprint every stored article that has no fingerprint yet, oldest first"""
+    total = 0
+    last_id = 0
+    while True:
+        batch = db.session.query(Article.id, Article.title, Article.content).filter(
+            Article.id > last_id,
+            ~exists().where(ArticleFingerprint.article_id == Article.id),
+        ).order_by(Article.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        total += cluster_articles(batch)
+    return total
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with app.app_context():
+        logger.info(f"Fingerprinted {backfill()} articles")
+        # Also repairs the representatives after articles were deactivated by hand
+        elect_representatives()
+        db.session.commit()
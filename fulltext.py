@@ -0,0 +1,201 @@
+import logging
+from sqlalchemy import text, select, func, cast, exists, literal, literal_column, table, column
+from sqlalchemy.dialects.postgresql import TSQUERY
+from app import db
+from models import Article
+from textnorm import tokenize, index_text
+
+logger = logging.getLogger(__name__)
+
+# Title matches count this many times more than body matches when ranking
+TITLE_WEIGHT = 10.0
+
+# Postgres keeps at most this many positions per word in a tsvector
+MAX_POSITIONS = 256
+MAX_POSITION = 16383
+
+# Text is normalized and tokenized by textnorm before it reaches the database, at
+# index and at query time alike, so the database only splits on spaces.
+
+# SQLite: an FTS5 table whose rowid is the article id. Rows are written from
+# Python after each batch commits; deletes are mirrored by a trigger. The ascii
+# tokenizer keeps every non-ASCII character inside tokens, so Bengali vowel signs
+# and conjuncts are not split the way unicode61 splits them.
+SQLITE_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5(title, content, tokenize='ascii')",
+    """CREATE TRIGGER IF NOT EXISTS article_fts_delete AFTER DELETE ON article BEGIN
+        DELETE FROM article_fts WHERE rowid = old.id;
+    END""",
+]
+
+# Postgres: a weighted tsvector per article with a GIN index; deletes cascade. The
+# tsvector is built in Python rather than by to_tsvector, whose parser would
+# split Bangla words apart.
+POSTGRES_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS article_search (
+        article_id INTEGER PRIMARY KEY REFERENCES article(id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_article_search_document ON article_search USING GIN (document)",
+]
+
+SQLITE_INSERT = text(
+    "INSERT OR REPLACE INTO article_fts (rowid, title, content) VALUES (:id, :title, :content)"
+)
+POSTGRES_INSERT = text(
+    "INSERT INTO article_search (article_id, document) VALUES (:id, CAST(:document AS tsvector)) "
+    "ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document"
+)
+
+article_fts = table('article_fts', column('rowid'))
+article_search = table('article_search', column('article_id'), column('document'))
+
+def dialect():
+    """Name of the database in use, or None when it has no full-text support here"""
+    name = db.engine.dialect.name
+    return name if name in ('sqlite', 'postgresql') else None
+
+def create_index():
+    """Create the full-text table, index and triggers; run by the schema migrations"""
+    schema = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRES_SCHEMA}.get(dialect())
+    if not schema:
+        logger.warning("Full-text search is not available for this database; using LIKE matching")
+        return
+    for statement in schema:
+        db.session.execute(text(statement))
+
+def reset_index():
+    """Empty the full-text index; SQLite's table is recreated in case its tokenizer changed"""
+    name = dialect()
+    if name == 'sqlite':
+        db.session.execute(text("DROP TABLE IF EXISTS article_fts"))
+        create_index()
+    elif name == 'postgresql':
+        db.session.execute(text("DELETE FROM article_search"))
+
+def rebuild_index():
+    """Index every article again, e.g. after the tokenizer changed"""
+    reset_index()
+    db.session.commit()
+    return sync_index()
+
+def tsvector_literal(title, content):
+    """Build a tsvector literal from tokenized text, title words weighted A and body words B"""
+    positions = {}
+    position = 0
+    for weight, tokens in (('A', tokenize(title)), ('B', tokenize(content))):
+        for token in tokens:
+            position += 1
+            entry = positions.setdefault(token, [])
+            if len(entry) < MAX_POSITIONS:
+                entry.append(f"{min(position, MAX_POSITION)}{weight}")
+    # Tokens hold only word characters, so quoting needs no escaping
+    return ' '.join(f"'{token}':{','.join(entry)}" for token, entry in positions.items())
+
+def index_articles(articles):
+    """Add (id, title, content) tuples to the full-text index and commit; return how many"""
+    name = dialect()
+    if name == 'sqlite':
+        insert = SQLITE_INSERT
+        rows = [{'id': article_id, 'title': index_text(title), 'content': index_text(content)}
+                for article_id, title, content in articles]
+    elif name == 'postgresql':
+        insert = POSTGRES_INSERT
+        rows = [{'id': article_id, 'document': tsvector_literal(title, content)}
+                for article_id, title, content in articles]
+    else:
+        return 0
+
+    if not rows:
+        return 0
+    try:
+        db.session.execute(insert, rows)
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error indexing articles for search: {str(e)}")
+        db.session.rollback()
+        return 0
+    return len(rows)
+
+def indexed(article_id):
+    """Condition that an article id is present in the full-text index"""
+    if dialect() == 'sqlite':
+        return exists().where(article_fts.c.rowid == article_id)
+    return exists().where(article_search.c.article_id == article_id)
+
+def sync_index(batch_size=500):
+    """Index every article missing from the full-text index, e.g. from a failed batch; return how many were added"""
+    if dialect() is None:
+        return 0
+    total = 0
+    last_id = 0
+    while True:
+        try:
+            batch = db.session.query(Article.id, Article.title, Article.content).filter(
+                Article.id > last_id,
+                ~indexed(Article.id),
+            ).order_by(Article.id).limit(batch_size).all()
+        except Exception as e:
+            logger.error(f"Error reading the search index: {str(e)}")
+            db.session.rollback()
+            break
+        if not batch:
+            break
+        added = index_articles(batch)
+        if not added:
+            break
+        total += added
+        last_id = batch[-1][0]
+    if total:
+        logger.info(f"Added {total} articles to the search index")
+    return total
+
+def fts_query(words):
+    """Quote every word for FTS5 and match the last one as a prefix"""
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+def tsquery_literal(words):
+    """The Postgres equivalent of fts_query: all words, the last as a prefix"""
+    quoted = [f"'{word}'" for word in words]
+    quoted[-1] += ':*'
+    return ' & '.join(quoted)
+
+def matches(terms):
+    """Subquery of (article_id, rank) for articles matching the terms, best first by rank"""
+    # Search box input goes through the same tokenizer as the index, which also
+    # drops quotes and operators that would otherwise break the query syntax
+    words = tokenize(terms)
+    if not words:
+        return None
+
+    name = dialect()
+    if name == 'sqlite':
+        # bm25() is lower for better matches, so negate it to sort descending like Postgres
+        rank = literal_column(f"-bm25(article_fts, {TITLE_WEIGHT}, 1.0)")
+        return select(article_fts.c.rowid.label('article_id'), rank.label('rank')).where(
+            literal_column('article_fts').op('MATCH')(fts_query(words))
+        ).subquery()
+    if name == 'postgresql':
+        tsquery = cast(literal(tsquery_literal(words)), TSQUERY)
+        return select(
+            article_search.c.article_id,
+            func.ts_rank_cd(article_search.c.document, tsquery).label('rank'),
+        ).where(article_search.c.document.op('@@')(tsquery)).subquery()
+    return None
+
+def apply_search(query, terms, ranked=False):
+    """Filter an Article query to full-text matches, ordered by relevance when ranked"""
+    found = matches(terms)
+    if found is None:
+        if dialect() is not None:
+            # Nothing searchable in the input (only punctuation)
+            return query.filter(db.false())
+        query = query.filter(db.or_(Article.title.contains(terms), Article.content.contains(terms)))
+        return query.order_by(Article.scraped_date.desc()) if ranked else query
+
+    query = query.join(found, found.c.article_id == Article.id)
+    if ranked:
+        query = query.order_by(found.c.rank.desc(), Article.scraped_date.desc())
+    return query
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from app import app
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """On-disk cache of listing pages keyed by URL, holding the body and its validators"""
+
+    def __init__(self, directory, max_bytes, max_age):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+    def path_for(self, url):
+        """Return the file holding the cache entry for a URL"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url):
+        """Return the cached entry for a URL, or None"""
+        try:
+            with open(self.path_for(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url):
+        """Build If-None-Match / If-Modified-Since headers from the cached validators"""
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def count(self, name):
+        """Increment one of the hit/miss counters"""
+        with self._lock:
+            self.stats[name] += 1
+
+    def not_modified(self, url):
+        """Record a 304 for a URL, refresh its age and return the cached body"""
+        self.count('hits')
+        entry = self.get(url)
+        if not entry:
+            return None
+        entry['stored_at'] = time.time()
+        self.write(url, entry)
+        return entry['body']
+
+    def store(self, url, response):
+        """Keep a full download if the server sent validators"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        self.write(url, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'body': response.text,
+        })
+        self.count('stores')
+
+    def write(self, url, entry):
+        """Atomically write a cache entry to disk"""
+        path = self.path_for(url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error writing response cache for {url}: {str(e)}")
+
+    def evict(self):
+        """Drop entries older than max_age, then the oldest ones until under max_bytes"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        except OSError:
+            return 0
+
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for mtime, size, path in sorted(entries):
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self.stats['evictions'] += evicted
+        return evicted
+
+# Shared by every scraper; entries live under the instance folder
+listing_cache = ResponseCache(
+    directory=app.config["RESPONSE_CACHE_DIR"],
+    max_bytes=app.config["RESPONSE_CACHE_MAX_BYTES"],
+    max_age=app.config["RESPONSE_CACHE_MAX_AGE"],
+)
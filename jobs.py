@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Durable scrape job queue in the scrape_job table, run by a bounded worker pool
+
+Usage: python jobs.py   (run a worker pool in the foreground until interrupted)
+"""
+
+import os
+import socket
+import zlib
+import threading
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from app import app, db
+from models import ScrapeJob
+from scrapers import build_scrapers, run_all_scrapers, CRAWL_MODES
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Postgres advisory lock taken while claiming, so two workers never start overlapping jobs
+CLAIM_LOCK = zlib.crc32(b'scrape_job_claim')
+
+def dedup_key(source, mode):
+    """Jobs with the same key do the same work"""
+    return f"{source or '*'}|{mode}"
+
+def enqueue_job(source=None, mode='incremental'):
+    """Queue a scrape of one source or all of them; return the new job, or the identical one already pending"""
+    if mode not in CRAWL_MODES:
+        raise ValueError(f"Unknown scraping mode: {mode}")
+    if source is not None and not build_scrapers(source):
+        raise ValueError(f"Unknown source: {source}")
+
+    key = dedup_key(source, mode)
+    job = ScrapeJob(source=source, mode=mode, dedup_key=key, status=PENDING)
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # The partial unique index allows one pending job per key
+        db.session.rollback()
+        job = ScrapeJob.query.filter_by(dedup_key=key, status=PENDING).first()
+        if job is None:
+            # It was claimed in between; queue again
+            return enqueue_job(source, mode)
+        logger.info(f"Scrape job {job.id} for {key} is already pending")
+        return job
+
+    logger.info(f"Queued scrape job {job.id} for {key}")
+    job_pool.wake()
+    return job
+
+def overlaps_running_job():
+    """Whether a running job already crawls a source that the ScrapeJob row in the outer query would"""
+    running = aliased(ScrapeJob)
+    # A job for every source overlaps any other job
+    return db.select(running.id).where(
+        running.status == RUNNING,
+        db.or_(running.source.is_(None), ScrapeJob.source.is_(None), running.source == ScrapeJob.source),
+    ).correlate(ScrapeJob).exists()
+
+def claim_job(worker):
+    """Mark the oldest pending job that overlaps no running one as running by this worker and return it, or None"""
+    while True:
+        if db.engine.dialect.name == 'postgresql':
+            # Released at commit; makes each claim see the ones committed before it
+            db.session.execute(db.text(f"SELECT pg_advisory_xact_lock({CLAIM_LOCK})"))
+        job_id = db.session.query(ScrapeJob.id).filter(
+            ScrapeJob.status == PENDING, ~overlaps_running_job()
+        ).order_by(ScrapeJob.id).limit(1).scalar()
+        if job_id is None:
+            db.session.commit()
+            return None
+        now = datetime.utcnow()
+        # Only one worker's conditional update can move the job out of pending
+        claimed = ScrapeJob.query.filter(
+            ScrapeJob.id == job_id, ScrapeJob.status == PENDING, ~overlaps_running_job()
+        ).update(
+            {'status': RUNNING, 'worker': worker, 'started_at': now, 'heartbeat_at': now},
+            synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            return db.session.get(ScrapeJob, job_id)
+
+def record_progress(job_id, done, total, found, saved):
+    """Store a running job's progress"""
+    try:
+        ScrapeJob.query.filter_by(id=job_id).update({
+            'sources_done': done, 'sources_total': total,
+            'articles_found': found, 'articles_saved': saved,
+            'heartbeat_at': datetime.utcnow(),
+        }, synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error recording progress of job {job_id}: {str(e)}")
+        db.session.rollback()
+
+def run_job(job):
+    """Run a claimed job to completion and record the outcome"""
+    job_id = job.id
+    logger.info(f"Running scrape job {job_id} ({job.dedup_key})")
+    try:
+        found, saved, errors = run_all_scrapers(
+            mode=job.mode, source=job.source,
+            progress=lambda done, total, found, saved: record_progress(job_id, done, total, found, saved)
+        )
+        update = {'status': DONE, 'articles_found': found, 'articles_saved': saved,
+                  'error': '; '.join(errors) if errors else None}
+        logger.info(f"Scrape job {job_id} completed: {found} found, {saved} saved")
+    except Exception as e:
+        logger.error(f"Scrape job {job_id} failed: {str(e)}")
+        db.session.rollback()
+        update = {'status': FAILED, 'error': str(e)}
+
+    update['finished_at'] = datetime.utcnow()
+    ScrapeJob.query.filter_by(id=job_id).update(update, synchronize_session=False)
+    db.session.commit()
+
+def requeue_stale_jobs():
+    """Put back running jobs whose worker stopped sending heartbeats, e.g. after a restart"""
+    cutoff = datetime.utcnow() - timedelta(seconds=app.config["JOB_STALE_AFTER"])
+    stale = ScrapeJob.query.filter(ScrapeJob.status == RUNNING, ScrapeJob.heartbeat_at < cutoff).all()
+    for job in stale:
+        try:
+            ScrapeJob.query.filter_by(id=job.id, status=RUNNING).update(
+                {'status': PENDING, 'worker': None}, synchronize_session=False
+            )
+            db.session.commit()
+            logger.info(f"Requeued interrupted scrape job {job.id}")
+        except IntegrityError:
+            # An identical job is already pending and will do the same work
+            db.session.rollback()
+            ScrapeJob.query.filter_by(id=job.id, status=RUNNING).update(
+                {'status': FAILED, 'finished_at': datetime.utcnow(),
+                 'error': 'Interrupted; an identical job was already queued'},
+                synchronize_session=False
+            )
+            db.session.commit()
+
+class JobWorkerPool:
+    """A fixed number of worker threads taking jobs from the queue, plus one heartbeat thread"""
+
+    def __init__(self, size=None, poll_interval=None):
+        self.size = size
+        self.poll_interval = poll_interval
+        self.threads = []
+        self._lock = threading.Lock()
+        self._running_jobs = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start the workers unless they are already running in this process"""
+        with self._lock:
+            if any(thread.is_alive() for thread in self.threads):
+                return
+            self._stop.clear()
+            size = self.size or app.config["JOB_WORKERS"]
+            name = f"{socket.gethostname()}:{os.getpid()}"
+            self.threads = [
+                threading.Thread(target=self.work, args=(f"{name}:{index}",), daemon=True, name=f'job-worker-{index}')
+                for index in range(size)
+            ]
+            self.threads.append(threading.Thread(target=self.heartbeat, daemon=True, name='job-heartbeat'))
+            for thread in self.threads:
+                thread.start()
+        logger.info(f"Started {size} scrape job workers")
+
+    def stop(self):
+        """Stop taking jobs and wait for running ones to finish"""
+        self._stop.set()
+        self._wake.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def wake(self):
+        """Let idle workers check the queue now instead of at their next poll"""
+        self._wake.set()
+
+    def work(self, worker):
+        """Worker loop: run jobs until the queue is empty, then wait for a wake-up or the poll interval"""
+        poll_interval = self.poll_interval or app.config["JOB_POLL_INTERVAL"]
+        while not self._stop.is_set():
+            job_id = None
+            try:
+                with app.app_context():
+                    job = claim_job(worker)
+                    if job is not None:
+                        job_id = job.id
+                        with self._lock:
+                            self._running_jobs.add(job_id)
+                        run_job(job)
+            except Exception as e:
+                logger.error(f"Error in scrape job worker {worker}: {str(e)}")
+            finally:
+                if job_id is not None:
+                    with self._lock:
+                        self._running_jobs.discard(job_id)
+
+            if job_id is None:
+                self._wake.wait(poll_interval)
+                self._wake.clear()
+
+    def heartbeat(self):
+        """Keep this process's running jobs fresh and requeue other workers' stale ones"""
+        interval = app.config["JOB_STALE_AFTER"] / 4
+        while True:
+            try:
+                with app.app_context():
+                    with self._lock:
+                        job_ids = list(self._running_jobs)
+                    if job_ids:
+                        ScrapeJob.query.filter(ScrapeJob.id.in_(job_ids)).update(
+                            {'heartbeat_at': datetime.utcnow()}, synchronize_session=False
+                        )
+                        db.session.commit()
+                    requeue_stale_jobs()
+            except Exception as e:
+                logger.error(f"Error in scrape job heartbeat: {str(e)}")
+            if self._stop.wait(interval):
+                return
+
+# Worker pool of this process
+job_pool = JobWorkerPool()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    job_pool.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        logger.info("Stopping scrape job workers")
+        job_pool.stop()
@@ -0,0 +1,177 @@
+import os
+import uuid
+import zlib
+import socket
+import threading
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import or_, text
+from sqlalchemy.exc import IntegrityError
+from app import app, db
+from models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+def process_id():
+    """Name of this process in leases and logs"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class AdvisoryLockLease:
+    """Postgres session advisory lock, held on a connection of its own; it is released if the process dies"""
+
+    def __init__(self, name):
+        # Advisory locks are keyed by a number
+        self.key = zlib.crc32(name.encode('utf-8'))
+        self.connection = None
+
+    def acquire(self):
+        """Try to take the lock without waiting"""
+        connection = db.engine.connect()
+        try:
+            held = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': self.key}).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if held:
+            self.connection = connection
+        else:
+            connection.close()
+        return bool(held)
+
+    def renew(self):
+        """Check that the connection holding the lock is still alive"""
+        try:
+            self.connection.execute(text("SELECT 1")).scalar()
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Lost the scheduler lock connection: {str(e)}")
+            self.connection.invalidate()
+            self.connection = None
+            return False
+
+    def release(self):
+        """Unlock and return the connection"""
+        if self.connection is None:
+            return
+        try:
+            self.connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self.key})
+            self.connection.commit()
+        finally:
+            self.connection.close()
+            self.connection = None
+
+class RowLease:
+    """A row in scheduler_lease that the holder keeps extending; anyone may take it once it expires"""
+
+    def __init__(self, name, holder, ttl):
+        self.name = name
+        self.holder = holder
+        self.ttl = ttl
+
+    def acquire(self):
+        """Take the lease if it is free, expired or already ours"""
+        now = datetime.utcnow()
+        taken = SchedulerLease.query.filter(
+            SchedulerLease.name == self.name,
+            or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+        ).update({'holder': self.holder, 'acquired_at': now, 'expires_at': now + timedelta(seconds=self.ttl)},
+                 synchronize_session=False)
+        db.session.commit()
+        if taken:
+            return True
+
+        try:
+            db.session.add(SchedulerLease(name=self.name, holder=self.holder, acquired_at=now,
+                                          expires_at=now + timedelta(seconds=self.ttl)))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            # Held by another live process
+            db.session.rollback()
+            return False
+
+    def renew(self):
+        """Extend the lease; False if another process took it meanwhile"""
+        renewed = SchedulerLease.query.filter_by(name=self.name, holder=self.holder).update(
+            {'expires_at': datetime.utcnow() + timedelta(seconds=self.ttl)}, synchronize_session=False
+        )
+        db.session.commit()
+        return bool(renewed)
+
+    def release(self):
+        """Expire the lease now so another process can take over without waiting"""
+        SchedulerLease.query.filter_by(name=self.name, holder=self.holder).update(
+            {'expires_at': datetime.utcnow()}, synchronize_session=False
+        )
+        db.session.commit()
+
+class LeaderElection:
+    """Keep trying to hold a named lease in a background thread; is_leader says whether this process has it"""
+
+    def __init__(self, name, ttl=None, wake=None):
+        self.name = name
+        self.ttl = ttl
+        # Event set whenever this process gains or loses the lease
+        self.wake = wake
+        self.holder = process_id()
+        self.lease = None
+        self.thread = None
+        self._leader = threading.Event()
+        self._stop = threading.Event()
+
+    @property
+    def is_leader(self):
+        return self._leader.is_set()
+
+    def start(self):
+        """Start campaigning for the lease"""
+        ttl = self.ttl or app.config["SCHEDULER_LEASE_TTL"]
+        with app.app_context():
+            if db.engine.dialect.name == 'postgresql':
+                self.lease = AdvisoryLockLease(self.name)
+            else:
+                self.lease = RowLease(self.name, self.holder, ttl)
+        self._stop.clear()
+        self.thread = threading.Thread(target=self.campaign, args=(ttl / 3,), daemon=True, name=f'{self.name}-lease')
+        self.thread.start()
+
+    def stop(self):
+        """Stop renewing and hand the lease over"""
+        self._stop.set()
+        if self.thread:
+            self.thread.join()
+        if self.is_leader:
+            with app.app_context():
+                try:
+                    self.lease.release()
+                except Exception as e:
+                    logger.error(f"Error releasing the {self.name} lease: {str(e)}")
+                    db.session.rollback()
+            self._leader.clear()
+
+    def campaign(self, interval):
+        """Acquire or renew the lease every interval seconds until stopped"""
+        while not self._stop.is_set():
+            try:
+                with app.app_context():
+                    if self.is_leader:
+                        held = self.lease.renew()
+                    else:
+                        held = self.lease.acquire()
+            except Exception as e:
+                logger.error(f"Error holding the {self.name} lease: {str(e)}")
+                held = False
+
+            if held and not self.is_leader:
+                logger.info(f"{self.holder} is now the {self.name} leader")
+                self._leader.set()
+                if self.wake:
+                    self.wake.set()
+            elif not held and self.is_leader:
+                logger.warning(f"{self.holder} lost the {self.name} lease")
+                self._leader.clear()
+                if self.wake:
+                    self.wake.set()
+            self._stop.wait(interval)
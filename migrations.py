@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from app import db
+import fulltext
+import changelog
+import fingerprints
+import rollups
+
+logger = logging.getLogger(__name__)
+
+# Ordered schema steps as (version, description, function). db.create_all() only
+# creates missing tables; indexes on existing tables, search tables and data
+# changes go here. Steps must be safe to re-run, since two workers starting at
+# once may both apply one before either records it.
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a function as the schema step with the given version"""
+    def register(function):
+        MIGRATIONS.append((version, description, function))
+        return function
+    return register
+
+@migration(1, "Full-text search tables")
+def create_search_index():
+    fulltext.create_index()
+
+@migration(2, "Re-index search documents with the Bangla-aware tokenizer")
+def reset_search_index():
+    # Rows are indexed again by migration 8
+    fulltext.reset_index()
+
+# (name, table, columns) for the listing, filter, stats and cleanup queries
+ARTICLE_INDEXES = [
+    # Index page: active articles, newest first
+    ('ix_article_active_scraped', 'article', 'is_active, scraped_date'),
+    # Index page filtered by source, and per-source counts
+    ('ix_article_source_active_scraped', 'article', 'source, is_active, scraped_date'),
+    # Index page filtered by category
+    ('ix_article_category_active_scraped', 'article', 'category, is_active, scraped_date'),
+    # Nightly cleanup of old articles, active or not
+    ('ix_article_scraped_date', 'article', 'scraped_date'),
+    # Recent scrapes on the index page
+    ('ix_scraping_log_timestamp', 'scraping_log', 'timestamp'),
+]
+
+@migration(3, "Composite indexes for the article hot query paths")
+def create_article_indexes():
+    for name, table, columns in ARTICLE_INDEXES:
+        db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+@migration(4, "Article change log triggers for incremental exports")
+def create_change_log():
+    changelog.create_triggers()
+
+@migration(5, "Seed the daily rollups behind /stats")
+def seed_rollups():
+    # Days whose articles were already cleaned up cannot be recounted
+    rollups.rebuild_rollups()
+
+@migration(6, "Change log writers commit in seq order")
+def serialize_change_log():
+    changelog.create_triggers()
+
+@migration(7, "Stored near-duplicate cluster representatives")
+def add_cluster_representatives():
+    # New databases already have the columns from db.create_all()
+    existing = {column['name'] for column in inspect(db.engine).get_columns('article_fingerprint')}
+    for name in ('representative', 'source_representative'):
+        if name not in existing:
+            db.session.execute(text(f"ALTER TABLE article_fingerprint ADD COLUMN {name} BOOLEAN NOT NULL DEFAULT FALSE"))
+    fingerprints.elect_representatives()
+
+@migration(8, "Index and fingerprint articles stored before the search index and fingerprints")
+def catch_up_indexes():
+    # Later gaps, from batches whose post-commit indexing failed, are filled by
+    # the scheduler's hourly catch-up job
+    fulltext.sync_index()
+    fingerprints.backfill()
+
+def ensure_version_table():
+    """Create the table recording which migrations have been applied"""
+    db.session.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, description VARCHAR(200), applied_at TIMESTAMP)"
+    ))
+    db.session.commit()
+
+def current_version():
+    """Highest applied migration version, 0 for a new database"""
+    return db.session.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+
+def migrate():
+    """Apply pending migrations in order, each in its own transaction; return the version reached"""
+    ensure_version_table()
+    version = current_version()
+
+    for step_version, description, function in sorted(MIGRATIONS, key=lambda step: step[0]):
+        if step_version <= version:
+            continue
+        try:
+            logger.info(f"Applying migration {step_version}: {description}")
+            function()
+            db.session.execute(
+                text("INSERT INTO schema_version (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {'version': step_version, 'description': description, 'applied_at': datetime.utcnow()}
+            )
+            db.session.commit()
+        except IntegrityError:
+            # Another worker applied and recorded this step first
+            db.session.rollback()
+        except Exception as e:
+            logger.error(f"Migration {step_version} failed: {str(e)}")
+            db.session.rollback()
+            break
+        version = step_version
+
+    return version
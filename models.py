@@ -1,6 +1,6 @@
 from app import db
 from datetime import datetime
-from sqlalchemy import Text, DateTime, String, Integer, Boolean
+from sqlalchemy import Text, DateTime, Date, String, Integer, Boolean, BigInteger, ForeignKey, LargeBinary
 
 class Article(db.Model):
     id = db.Column(Integer, primary_key=True)
@@ -19,11 +19,15 @@ class Article(db.Model):
     def __repr__(self):
         return f'<Article {self.title[:50]}...>'
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_content=True):
+        data = {
             'id': self.id,
             'title': self.title,
-            'content': self.content,
+        }
+        # Listings skip the body so a deferred content column is never loaded
+        if include_content:
+            data['content'] = self.content
+        data.update({
             'summary': self.summary,
             'url': self.url,
             'source': self.source,
@@ -33,7 +37,8 @@ class Article(db.Model):
             'category': self.category,
             'image_url': self.image_url,
             'is_active': self.is_active
-        }
+        })
+        return data
 
 class ScrapingLog(db.Model):
     id = db.Column(Integer, primary_key=True)
@@ -46,3 +51,133 @@ class ScrapingLog(db.Model):
 
     def __repr__(self):
         return f'<ScrapingLog {self.source} - {self.timestamp}>'
+
+class ArticleFingerprint(db.Model):
+    """SimHash of an article's text, split into four 16-bit LSH bands, and its near-duplicate cluster"""
+    article_id = db.Column(Integer, ForeignKey('article.id', ondelete='CASCADE'), primary_key=True)
+    simhash = db.Column(BigInteger, nullable=False)
+    band0 = db.Column(Integer, nullable=False, index=True)
+    band1 = db.Column(Integer, nullable=False, index=True)
+    band2 = db.Column(Integer, nullable=False, index=True)
+    band3 = db.Column(Integer, nullable=False, index=True)
+    cluster_id = db.Column(Integer, nullable=False)
+    # Set on the earliest active article of the cluster, and of the cluster within its source
+    representative = db.Column(Boolean, nullable=False, default=False)
+    source_representative = db.Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        db.Index('ix_article_fingerprint_cluster', 'cluster_id', 'article_id'),
+    )
+
+    def __repr__(self):
+        return f'<ArticleFingerprint {self.article_id} cluster {self.cluster_id}>'
+
+class FacetCount(db.Model):
+    """Precomputed article counts per source and category, rebuilt after each scrape and cleanup"""
+    facet = db.Column(String(20), primary_key=True)
+    value = db.Column(String(100), primary_key=True)
+    count = db.Column(Integer, nullable=False, default=0)
+    updated_at = db.Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<FacetCount {self.facet}={self.value}: {self.count}>'
+
+class ArticleChange(db.Model):
+    """Ordered log of articles added, deactivated or deleted, written by database triggers"""
+    seq = db.Column(Integer, primary_key=True)
+    article_id = db.Column(Integer, nullable=False)
+    change = db.Column(String(20), nullable=False)
+    changed_at = db.Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ArticleChange {self.seq} {self.change} {self.article_id}>'
+
+class DailyArticleCount(db.Model):
+    """Articles scraped per day, source and category; kept when old articles are cleaned up"""
+    day = db.Column(Date, primary_key=True)
+    source = db.Column(String(100), primary_key=True)
+    category = db.Column(String(100), primary_key=True, default='')
+    count = db.Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DailyArticleCount {self.day} {self.source}/{self.category}: {self.count}>'
+
+class DailyScrapeCount(db.Model):
+    """Scraper runs per day and source, summed from ScrapingLog"""
+    day = db.Column(Date, primary_key=True)
+    source = db.Column(String(100), primary_key=True)
+    runs = db.Column(Integer, nullable=False, default=0)
+    failures = db.Column(Integer, nullable=False, default=0)
+    articles_found = db.Column(Integer, nullable=False, default=0)
+    articles_saved = db.Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DailyScrapeCount {self.day} {self.source}: {self.runs} runs>'
+
+class ArticleArchive(db.Model):
+    """An expired article moved out of the article table, stored as zlib-compressed JSON"""
+    id = db.Column(Integer, primary_key=True)
+    article_id = db.Column(Integer, nullable=False, index=True)
+    source = db.Column(String(100), nullable=False)
+    scraped_date = db.Column(DateTime)
+    archived_at = db.Column(DateTime, default=datetime.utcnow)
+    data = db.Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f'<ArticleArchive {self.article_id}>'
+
+class ScrapeJob(db.Model):
+    """A queued scrape of every source or of one source, run by the jobs worker pool"""
+    __table_args__ = (
+        db.Index('ix_scrape_job_status', 'status', 'id'),
+        # At most one pending job per (source, mode); identical requests share it
+        db.Index('ix_scrape_job_pending', 'dedup_key', unique=True,
+                 sqlite_where=db.text("status = 'pending'"), postgresql_where=db.text("status = 'pending'")),
+    )
+
+    id = db.Column(Integer, primary_key=True)
+    source = db.Column(String(100))
+    mode = db.Column(String(20), nullable=False, default='incremental')
+    dedup_key = db.Column(String(150), nullable=False)
+    status = db.Column(String(20), nullable=False, default='pending')
+    created_at = db.Column(DateTime, default=datetime.utcnow)
+    started_at = db.Column(DateTime)
+    finished_at = db.Column(DateTime)
+    heartbeat_at = db.Column(DateTime)
+    worker = db.Column(String(200))
+    sources_total = db.Column(Integer, default=0)
+    sources_done = db.Column(Integer, default=0)
+    articles_found = db.Column(Integer, default=0)
+    articles_saved = db.Column(Integer, default=0)
+    error = db.Column(Text)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'source': self.source,
+            'mode': self.mode,
+            'status': self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'progress': {
+                'sources_done': self.sources_done,
+                'sources_total': self.sources_total,
+                'articles_found': self.articles_found,
+                'articles_saved': self.articles_saved,
+            },
+            'error': self.error,
+        }
+
+    def __repr__(self):
+        return f'<ScrapeJob {self.id} {self.status}>'
+
+class SchedulerLease(db.Model):
+    """Which process holds a named lease, and until when; used where advisory locks are unavailable"""
+    name = db.Column(String(50), primary_key=True)
+    holder = db.Column(String(200), nullable=False)
+    acquired_at = db.Column(DateTime, default=datetime.utcnow)
+    expires_at = db.Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<SchedulerLease {self.name} held by {self.holder}>'
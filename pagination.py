@@ -0,0 +1,98 @@
+import time
+import base64
+import threading
+import binascii
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import tuple_
+from app import app
+from models import Article
+
+class KeysetPage:
+    """One page of a listing ordered newest first by (scraped_date, id)"""
+
+    def __init__(self, items, has_next, has_prev):
+        self.items = items
+        self.has_next = has_next
+        self.has_prev = has_prev
+
+    @property
+    def next_cursor(self):
+        """Cursor for the page after this one, or None on the last page"""
+        return encode_cursor(self.items[-1]) if self.has_next and self.items else None
+
+    @property
+    def prev_cursor(self):
+        """Cursor for the page before this one, or None on the first page"""
+        return encode_cursor(self.items[0]) if self.has_prev and self.items else None
+
+def encode_cursor(article):
+    """Opaque URL-safe token for an article's position in the listing"""
+    raw = f"{article.scraped_date.isoformat()}|{article.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Return the (scraped_date, id) position in a cursor, or None if it is missing or invalid"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8')
+        scraped_date, article_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(scraped_date), int(article_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+def keyset_page(query, per_page, after=None, before=None):
+    """Fetch the page after or before a cursor position with a range seek instead of OFFSET"""
+    key = tuple_(Article.scraped_date, Article.id)
+    # Rows without a scrape date have no position a cursor could point at
+    query = query.filter(Article.scraped_date.isnot(None))
+
+    if before:
+        # Walk backwards from the cursor, then restore newest-first order
+        rows = query.filter(key > tuple_(*before)).order_by(
+            Article.scraped_date.asc(), Article.id.asc()
+        ).limit(per_page + 1).all()
+        return KeysetPage(list(reversed(rows[:per_page])), has_next=True, has_prev=len(rows) > per_page)
+
+    if after:
+        query = query.filter(key < tuple_(*after))
+    rows = query.order_by(Article.scraped_date.desc(), Article.id.desc()).limit(per_page + 1).all()
+    return KeysetPage(rows[:per_page], has_next=len(rows) > per_page, has_prev=after is not None)
+
+class CountCache:
+    """Article counts per filter combination, recomputed at most once per TTL
+
+    Keys include free-text searches, so only the max_entries most recently used
+    counts are kept.
+    """
+
+    def __init__(self, ttl, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counts = OrderedDict()
+
+    def get(self, key, query):
+        """Return the cached count for a key, counting the query when it is missing or stale"""
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry:
+                self._counts.move_to_end(key)
+        if entry and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+
+        count = query.order_by(None).count()
+        with self._lock:
+            self._counts[key] = (count, time.monotonic())
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return count
+
+    def clear(self):
+        """Forget every cached count"""
+        with self._lock:
+            self._counts.clear()
+
+count_cache = CountCache(ttl=app.config["LISTING_COUNT_TTL"], max_entries=app.config["LISTING_COUNT_CACHE_SIZE"])
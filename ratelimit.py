@@ -0,0 +1,132 @@
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from app import app
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean the host wants us to slow down
+BACKOFF_STATUSES = (429, 503)
+
+class TokenBucket:
+    """Token bucket for a single host whose rate adapts to how the host responds"""
+
+    def __init__(self, rate, burst, min_rate, max_rate, target_latency):
+        self.rate = rate
+        self.capacity = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens may go negative: each waiting caller has its own slot in the queue
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def pause(self, seconds):
+        """Hold all requests to this host for the given number of seconds"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Go into debt so the first token frees up when the pause ends and
+            # callers queued behind it keep their spacing instead of all waking together
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def observe(self, latency, status=None):
+        """Adjust the rate: halve on back-off, ease off on slow replies, otherwise creep back up"""
+        with self._lock:
+            if status in BACKOFF_STATUSES:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.75)
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+def parse_retry_after(value):
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def host_of(url):
+    """Return the lowercase host a URL points at"""
+    return (urlparse(url).hostname or '').lower()
+
+class HostRateLimiter:
+    """Per-host token buckets shared by every scraper thread, plus a global connection cap"""
+
+    def __init__(self, default_settings, host_settings=None, max_connections=8, max_retry_after=300):
+        self.default_settings = default_settings
+        self.host_settings = host_settings or {}
+        self.max_retry_after = max_retry_after
+        self._connections = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def bucket(self, host):
+        """Return the bucket for a host, creating it from configuration on first use"""
+        with self._lock:
+            if host not in self._buckets:
+                settings = dict(self.default_settings, **self.host_settings.get(host, {}))
+                self._buckets[host] = TokenBucket(
+                    rate=settings['rate'],
+                    burst=settings['burst'],
+                    min_rate=settings['min_rate'],
+                    max_rate=settings['max_rate'],
+                    target_latency=settings['target_latency'],
+                )
+            return self._buckets[host]
+
+    @contextmanager
+    def request(self, url):
+        """Wait once for the host's token, then hold a global connection slot"""
+        wait = self.bucket(host_of(url)).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._connections:
+            yield
+
+    def record(self, url, latency, status=None, retry_after=None):
+        """Feed a response back into the host's bucket"""
+        bucket = self.bucket(host_of(url))
+        bucket.observe(latency, status)
+
+        if status in BACKOFF_STATUSES:
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = 1 / bucket.rate
+            delay = min(delay, self.max_retry_after)
+            logger.warning(f"{host_of(url)} answered {status}; pausing {delay:.1f}s at {bucket.rate:.2f} req/s")
+            bucket.pause(delay)
+
+# Shared by every scraper so that two sources on the same host share one budget
+rate_limiter = HostRateLimiter(
+    default_settings=app.config["SCRAPER_RATE_LIMIT_DEFAULT"],
+    host_settings=app.config["SCRAPER_RATE_LIMITS"],
+    max_connections=app.config["SCRAPER_MAX_CONNECTIONS"],
+)
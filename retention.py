@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Retention: delete or archive expired articles in bounded batches
+
+Usage: python retention.py [--archive table|file] [--batch-size N]
+Expired articles are those scraped more than RETENTION_DAYS days ago, or the
+source's entry in RETENTION_DAYS_BY_SOURCE.
+"""
+
+import sys
+import os
+import argparse
+import gzip
+import json
+import logging
+import time
+import zlib
+from datetime import datetime, timedelta
+from app import app, db
+from models import Article, ArticleArchive
+from exports import JSON_COLUMNS, row_dict
+from fingerprints import clusters_of, elect_representatives
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MODES = ('table', 'file')
+
+def retention_rules(now=None):
+    """(source or None for all other sources, cutoff date) for each retention period"""
+    now = now or datetime.utcnow()
+    by_source = app.config["RETENTION_DAYS_BY_SOURCE"]
+    rules = [(source, now - timedelta(days=days)) for source, days in sorted(by_source.items())]
+    rules.append((None, now - timedelta(days=app.config["RETENTION_DAYS"])))
+    return rules
+
+def expired_ids(source, cutoff, limit):
+    """Ids of the oldest expired articles for a rule, at most limit of them"""
+    query = db.session.query(Article.id).filter(Article.scraped_date < cutoff)
+    if source is not None:
+        query = query.filter(Article.source == source)
+    elif app.config["RETENTION_DAYS_BY_SOURCE"]:
+        query = query.filter(Article.source.notin_(list(app.config["RETENTION_DAYS_BY_SOURCE"])))
+    return [article_id for article_id, in query.order_by(Article.scraped_date).limit(limit)]
+
+def archive_to_table(rows):
+    """Copy article rows into article_archive, one compressed JSON document each"""
+    now = datetime.utcnow()
+    db.session.execute(db.insert(ArticleArchive), [
+        {
+            'article_id': row.id,
+            'source': row.source,
+            'scraped_date': row.scraped_date,
+            'archived_at': now,
+            'data': zlib.compress(json.dumps(row_dict(row), ensure_ascii=False).encode('utf-8')),
+        }
+        for row in rows
+    ])
+
+def archive_to_file(rows):
+    """Write article rows to a temporary gzipped NDJSON file; return it and the name it gets once committed"""
+    directory = app.config["RETENTION_ARCHIVE_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    ids = [row.id for row in rows]
+    path = os.path.join(directory, f'articles_{datetime.utcnow().strftime("%Y%m%d")}_{min(ids)}-{max(ids)}.ndjson.gz')
+    temp_path = path + '.tmp'
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+        for row in rows:
+            archive.write(json.dumps(row_dict(row), ensure_ascii=False) + '\n')
+    return temp_path, path
+
+def expire_batch(ids, archive=None):
+    """Archive (optionally) and delete one batch of articles in a single transaction"""
+    archive_file = None
+    try:
+        if archive:
+            rows = db.session.query(*JSON_COLUMNS).filter(Article.id.in_(ids)).all()
+            if archive == 'table':
+                archive_to_table(rows)
+            elif rows:
+                archive_file = archive_to_file(rows)
+        clusters = clusters_of(ids)
+        # Fingerprints and search rows go with the article through ON DELETE CASCADE
+        # or triggers, and the change log records each delete
+        deleted = db.session.query(Article).filter(Article.id.in_(ids)).delete(synchronize_session=False)
+        # Clusters that lose their representative get the next article as one
+        elect_representatives(clusters)
+        db.session.commit()
+    except Exception:
+        # The batch is retried on the next run, so its archive file must not stay behind
+        if archive_file:
+            os.remove(archive_file[0])
+        raise
+    # Only committed batches get an archive file; a crash before this rename
+    # leaves a .tmp file rather than a second copy of the batch
+    if archive_file:
+        os.replace(*archive_file)
+    return deleted
+
+def apply_retention(archive=None, batch_size=None):
+    """Expire old articles batch by batch; return a report of every batch as dicts"""
+    archive = app.config["RETENTION_ARCHIVE"] if archive is None else archive
+    if archive and archive not in ARCHIVE_MODES:
+        raise ValueError(f"Unknown retention archive mode: {archive}")
+    batch_size = batch_size or app.config["RETENTION_BATCH_SIZE"]
+
+    report = []
+    for source, cutoff in retention_rules():
+        label = source or 'all other sources'
+        while True:
+            started = time.perf_counter()
+            ids = expired_ids(source, cutoff, batch_size)
+            if not ids:
+                break
+            try:
+                rows = expire_batch(ids, archive)
+            except Exception as e:
+                logger.error(f"Error expiring articles for {label}: {str(e)}")
+                db.session.rollback()
+                break
+            seconds = time.perf_counter() - started
+            report.append({'source': label, 'rows': rows, 'seconds': seconds})
+            logger.info(f"Retention: {'archived' if archive else 'deleted'} {rows} articles "
+                        f"for {label} in {seconds:.2f}s")
+            if len(ids) < batch_size:
+                break
+    return report
+
+def main():
+    """Run retention once and report the totals"""
+    parser = argparse.ArgumentParser(description="Delete or archive expired articles")
+    parser.add_argument('--archive', choices=ARCHIVE_MODES, default=None,
+                        help="archive expired articles first (default: RETENTION_ARCHIVE)")
+    parser.add_argument('--batch-size', type=int, default=None, help="articles per batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    with app.app_context():
+        report = apply_retention(args.archive, args.batch_size)
+        if report:
+            from facets import rebuild_facets
+            rebuild_facets()
+    rows = sum(batch['rows'] for batch in report)
+    seconds = sum(batch['seconds'] for batch in report)
+    logger.info(f"Expired {rows} articles in {len(report)} batches ({seconds:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Daily rollups of scraped articles and scraper runs, read by /stats
+
+Usage: python rollups.py   (rebuild both rollups from the rows still stored)
+"""
+
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from sqlalchemy.dialects import postgresql, sqlite
+from app import app, db
+from models import Article, ScrapingLog, DailyArticleCount, DailyScrapeCount
+
+logger = logging.getLogger(__name__)
+
+# Windows offered on /stats, in days
+STATS_WINDOWS = (30, 90, 365)
+
+def as_date(value):
+    """Dates come back as strings from SQLite's date()"""
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+def upsert(model, rows, keys, counters):
+    """Insert rollup rows, adding the counters onto rows that already exist"""
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(model.__table__).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: model.__table__.c[name] + stmt.excluded[name] for name in counters},
+        )
+        db.session.execute(stmt)
+        return
+
+    # Other databases: read, add and write back
+    for row in rows:
+        existing = db.session.get(model, tuple(row[key] for key in keys))
+        if existing is None:
+            db.session.add(model(**row))
+        else:
+            for name in counters:
+                setattr(existing, name, getattr(existing, name) + row[name])
+
+def record_articles(articles):
+    """Count newly saved (scraped_date, source, category) tuples into the daily rollup"""
+    counts = Counter((as_date(scraped_date or datetime.utcnow()), source, category or '')
+                     for scraped_date, source, category in articles)
+    if not counts:
+        return
+    rows = [{'day': day, 'source': source, 'category': category, 'count': count}
+            for (day, source, category), count in counts.items()]
+    try:
+        upsert(DailyArticleCount, rows, ['day', 'source', 'category'], ['count'])
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error updating daily article rollup: {str(e)}")
+        db.session.rollback()
+
+def record_scrape(log):
+    """Add one ScrapingLog entry to the daily scrape rollup"""
+    row = {
+        'day': as_date(log.timestamp or datetime.utcnow()),
+        'source': log.source,
+        'runs': 1,
+        'failures': 0 if log.success else 1,
+        'articles_found': log.articles_found or 0,
+        'articles_saved': log.articles_saved or 0,
+    }
+    try:
+        upsert(DailyScrapeCount, [row], ['day', 'source'],
+               ['runs', 'failures', 'articles_found', 'articles_saved'])
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error updating daily scrape rollup: {str(e)}")
+        db.session.rollback()
+
+def rebuild_rollups():
+    """Recount both rollups from scratch; days whose articles were cleaned up are lost"""
+    day = db.func.date(Article.scraped_date)
+    category = db.func.coalesce(Article.category, '')
+    article_rows = [
+        {'day': as_date(row_day), 'source': source, 'category': row_category, 'count': count}
+        for row_day, source, row_category, count in db.session.query(
+            day, Article.source, category, db.func.count(Article.id)
+        ).filter(Article.scraped_date.isnot(None)).group_by(day, Article.source, category)
+    ]
+
+    log_day = db.func.date(ScrapingLog.timestamp)
+    scrape_rows = [
+        {'day': as_date(row_day), 'source': source, 'runs': runs, 'failures': failures or 0,
+         'articles_found': found or 0, 'articles_saved': saved or 0}
+        for row_day, source, runs, failures, found, saved in db.session.query(
+            log_day, ScrapingLog.source, db.func.count(ScrapingLog.id),
+            db.func.sum(db.case((ScrapingLog.success == False, 1), else_=0)),
+            db.func.sum(ScrapingLog.articles_found), db.func.sum(ScrapingLog.articles_saved),
+        ).filter(ScrapingLog.timestamp.isnot(None)).group_by(log_day, ScrapingLog.source)
+    ]
+
+    db.session.query(DailyArticleCount).delete()
+    db.session.query(DailyScrapeCount).delete()
+    if article_rows:
+        db.session.execute(db.insert(DailyArticleCount), article_rows)
+    if scrape_rows:
+        db.session.execute(db.insert(DailyScrapeCount), scrape_rows)
+    db.session.commit()
+    return len(article_rows), len(scrape_rows)
+
+def window_stats(days):
+    """Everything /stats shows for the last `days` days, read from the rollups only"""
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+
+    daily = db.session.query(
+        DailyArticleCount.day, db.func.sum(DailyArticleCount.count)
+    ).filter(DailyArticleCount.day >= since).group_by(DailyArticleCount.day).order_by(DailyArticleCount.day).all()
+
+    by_source = db.session.query(
+        DailyArticleCount.source, db.func.sum(DailyArticleCount.count).label('count')
+    ).filter(DailyArticleCount.day >= since).group_by(DailyArticleCount.source).order_by(db.desc('count')).all()
+
+    by_category = db.session.query(
+        DailyArticleCount.category, db.func.sum(DailyArticleCount.count).label('count')
+    ).filter(DailyArticleCount.day >= since, DailyArticleCount.category != '').group_by(
+        DailyArticleCount.category
+    ).order_by(db.desc('count')).all()
+
+    scrapes = db.session.query(
+        DailyScrapeCount.source,
+        db.func.sum(DailyScrapeCount.runs),
+        db.func.sum(DailyScrapeCount.failures),
+        db.func.sum(DailyScrapeCount.articles_found),
+        db.func.sum(DailyScrapeCount.articles_saved),
+    ).filter(DailyScrapeCount.day >= since).group_by(DailyScrapeCount.source).order_by(DailyScrapeCount.source).all()
+
+    return {
+        'since': since,
+        'daily': [(as_date(day), count) for day, count in daily],
+        'by_source': by_source,
+        'by_category': by_category,
+        'scrapes': scrapes,
+        'total': sum(count for _, count in daily),
+    }
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with app.app_context():
+        articles, scrapes = rebuild_rollups()
+        logger.info(f"Rebuilt {articles} daily article rows and {scrapes} daily scrape rows")
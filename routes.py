@@ -1,67 +1,114 @@
-from flask import render_template, request, jsonify, redirect, url_for, flash, send_file, make_response
+from flask import render_template, request, jsonify, redirect, url_for, flash, Response, stream_with_context
 from app import app, db
-from models import Article, ScrapingLog
-from scrapers import run_all_scrapers
-from datetime import datetime, timedelta
-import csv
-import json
-import io
+from models import Article, ScrapingLog, ScrapeJob
+from jobs import enqueue_job, job_pool
+from fingerprints import collapse_duplicates
+from fulltext import apply_search
+from pagination import keyset_page, decode_cursor, count_cache
+from facets import load_facets
+from rollups import STATS_WINDOWS, window_stats
+from exports import (CSV_COLUMNS, JSON_COLUMNS, CHANGE_CSV_HEADER, export_query, export_response,
+                     csv_lines, json_document, ndjson_lines, change_dict, change_csv_fields)
+from changelog import change_window, changes_query
+from columnar import columnar_chunks, available as columnar_available
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
-@app.route('/')
-def index():
-    """Main page showing recent articles"""
-    page = request.args.get('page', 1, type=int)
-    search = request.args.get('search', '')
-    source = request.args.get('source', '')
-    category = request.args.get('category', '')
+def listing_query(args):
+    """Active articles narrowed by the search, source, category and collapse filters of a request"""
+    query = Article.query.filter_by(is_active=True).options(db.defer(Article.content))
     
-    # Build query
-    query = Article.query.filter_by(is_active=True)
-    
-    # Apply filters
+    search = args.get('search', '')
     if search:
-        query = query.filter(
-            db.or_(
-                Article.title.contains(search),
-                Article.content.contains(search)
-            )
-        )
+        query = apply_search(query, search)
     
+    source = args.get('source', '')
     if source:
         query = query.filter(Article.source == source)
     
+    category = args.get('category', '')
     if category:
         query = query.filter(Article.category == category)
     
-    # Order by scraped date and paginate
-    articles = query.order_by(Article.scraped_date.desc()).paginate(
-        page=page, per_page=10, error_out=False
-    )
+    # Show each near-duplicate story once. The stored representative may not pass
+    # the category or search filter, so those rank the cluster members they match
+    if args.get('collapse', '') == '1':
+        if search or category:
+            query = collapse_duplicates(query, scope='filtered')
+        else:
+            query = collapse_duplicates(query, scope='source' if source else 'all')
+    
+    return query
+
+def listing_count_key(args):
+    """Cache key for the number of articles matching a request's filters"""
+    return tuple(args.get(name, '') for name in ('search', 'source', 'category', 'collapse'))
+
+@app.route('/')
+def index():
+    """Main page showing recent articles, paged by cursor"""
+    search = request.args.get('search', '')
+    source = request.args.get('source', '')
+    category = request.args.get('category', '')
+    collapse = request.args.get('collapse', '') == '1'
     
-    # Get available sources and categories for filters
-    sources = db.session.query(Article.source).distinct().all()
-    sources = [s[0] for s in sources if s[0]]
+    # Seek to the cursor position instead of counting rows with OFFSET
+    query = listing_query(request.args)
+    articles = keyset_page(
+        query,
+        per_page=10,
+        after=decode_cursor(request.args.get('after')),
+        before=decode_cursor(request.args.get('before')),
+    )
     
-    categories = db.session.query(Article.category).distinct().all()
-    categories = [c[0] for c in categories if c[0]]
+    # Filter dropdowns and totals come from the facet table, rebuilt after each scrape
+    facets = load_facets()
+    if search or collapse or (source and category):
+        matching_articles = count_cache.get(listing_count_key(request.args), query)
+    elif source:
+        matching_articles = dict(facets['sources']).get(source, 0)
+    elif category:
+        matching_articles = dict(facets['categories']).get(category, 0)
+    else:
+        matching_articles = facets['total']
     
     # Get scraping statistics
-    total_articles = Article.query.filter_by(is_active=True).count()
     recent_scrapes = ScrapingLog.query.order_by(ScrapingLog.timestamp.desc()).limit(5).all()
     
     return render_template('index.html', 
                          articles=articles,
-                         sources=sources,
-                         categories=categories,
+                         sources=facets['sources'],
+                         categories=facets['categories'],
                          search=search,
                          selected_source=source,
                          selected_category=category,
-                         total_articles=total_articles,
+                         collapse=collapse,
+                         matching_articles=matching_articles,
+                         total_articles=facets['total'],
                          recent_scrapes=recent_scrapes)
 
+@app.route('/api/articles')
+def api_articles():
+    """JSON listing with the index page filters; pass next_cursor back as ?after= for the next page"""
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    query = listing_query(request.args)
+    articles = keyset_page(
+        query,
+        per_page=limit,
+        after=decode_cursor(request.args.get('after')),
+        before=decode_cursor(request.args.get('before')),
+    )
+    
+    return jsonify({
+        # Listings leave out the article body, which is never loaded for them
+        'articles': [article.to_dict(include_content=False) for article in articles.items],
+        'next_cursor': articles.next_cursor,
+        'prev_cursor': articles.prev_cursor,
+        'count': count_cache.get(listing_count_key(request.args), query),
+    })
+
 @app.route('/article/<int:article_id>')
 def article_detail(article_id):
     """Show article details"""
@@ -70,73 +117,48 @@ def article_detail(article_id):
 
 @app.route('/scrape')
 def manual_scrape():
-    """Manually trigger scraping"""
+    """Queue a scrape; ?mode=backfill crawls deeper than the usual incremental run, ?source= scrapes one source"""
+    mode = request.args.get('mode', 'incremental')
+    source = request.args.get('source') or None
+    
     try:
-        # For now, show a message that scraping is in progress
-        # In a production environment, this would be handled by a background task
-        flash('News scraping started! This may take a few minutes to complete. Please check back shortly for new articles.', 'info')
-        
-        # Try to run a quick scrape with limited articles to avoid timeout
-        import threading
-        def background_scrape():
-            try:
-                from app import app
-                with app.app_context():
-                    found, saved, errors = run_all_scrapers()
-                    logger.info(f"Background scraping completed: {found} found, {saved} saved, errors: {errors}")
-            except Exception as e:
-                logger.error(f"Background scraping error: {str(e)}")
-        
-        # Start background scraping (this will run asynchronously)
-        thread = threading.Thread(target=background_scrape)
-        thread.daemon = True
-        thread.start()
-            
+        # Repeated clicks share the job that is already waiting
+        job = enqueue_job(source=source, mode=mode)
+        job_pool.start()
+        flash(f'News scraping queued as job {job.id}. This may take a few minutes to complete. '
+              f'Please check back shortly for new articles.', 'info')
+    except ValueError as e:
+        flash(str(e), 'error')
     except Exception as e:
         logger.error(f"Error in manual scraping: {str(e)}")
         flash(f'Error occurred during scraping: {str(e)}', 'error')
     
     return redirect(url_for('index'))
 
+@app.route('/api/jobs/<int:job_id>')
+def job_status(job_id):
+    """Status and progress of a scrape job"""
+    job = db.session.get(ScrapeJob, job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
 @app.route('/export')
 def export_page():
     """Export page"""
     return render_template('export.html')
 
+def export_options():
+    """Read the collapse and gzip options shared by the export routes"""
+    return request.args.get('collapse', '') == '1', request.args.get('gzip', '') == '1'
+
 @app.route('/export/csv')
 def export_csv():
-    """Export articles to CSV"""
+    """Stream articles as CSV; ?collapse=1 keeps one article per near-duplicate cluster, ?gzip=1 compresses"""
     try:
-        articles = Article.query.filter_by(is_active=True).order_by(Article.scraped_date.desc()).all()
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['ID', 'Title', 'Source', 'URL', 'Published Date', 'Scraped Date', 'Author', 'Category', 'Summary'])
-        
-        # Write data
-        for article in articles:
-            writer.writerow([
-                article.id,
-                article.title,
-                article.source,
-                article.url,
-                article.published_date.strftime('%Y-%m-%d %H:%M:%S') if article.published_date else '',
-                article.scraped_date.strftime('%Y-%m-%d %H:%M:%S') if article.scraped_date else '',
-                article.author or '',
-                article.category or '',
-                article.summary or ''
-            ])
-        
-        output.seek(0)
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=sylheti_news_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        
-        return response
+        collapse, compress = export_options()
+        query = export_query(CSV_COLUMNS, collapse)
+        return export_response(csv_lines(query), 'CSV', 'csv', 'text/csv', compress)
         
     except Exception as e:
         logger.error(f"Error exporting CSV: {str(e)}")
@@ -145,76 +167,124 @@ def export_csv():
 
 @app.route('/export/json')
 def export_json():
-    """Export articles to JSON"""
+    """Stream articles as a JSON document; same options as the CSV export"""
     try:
-        articles = Article.query.filter_by(is_active=True).order_by(Article.scraped_date.desc()).all()
+        collapse, compress = export_options()
+        query = export_query(JSON_COLUMNS, collapse)
+        return export_response(json_document(query), 'JSON', 'json', 'application/json', compress)
         
-        data = {
-            'export_date': datetime.now().isoformat(),
-            'total_articles': len(articles),
-            'articles': [article.to_dict() for article in articles]
-        }
+    except Exception as e:
+        logger.error(f"Error exporting JSON: {str(e)}")
+        flash(f'Error exporting JSON: {str(e)}', 'error')
+        return redirect(url_for('export_page'))
+
+@app.route('/export/ndjson')
+def export_ndjson():
+    """Stream articles as newline-delimited JSON, one article per line"""
+    try:
+        collapse, compress = export_options()
+        query = export_query(JSON_COLUMNS, collapse)
+        return export_response(ndjson_lines(query), 'NDJSON', 'ndjson', 'application/x-ndjson', compress)
         
-        # Create response
-        response = make_response(json.dumps(data, indent=2, ensure_ascii=False))
-        response.headers['Content-Type'] = 'application/json'
-        response.headers['Content-Disposition'] = f'attachment; filename=sylheti_news_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    except Exception as e:
+        logger.error(f"Error exporting NDJSON: {str(e)}")
+        flash(f'Error exporting NDJSON: {str(e)}', 'error')
+        return redirect(url_for('export_page'))
+
+@app.route('/export/<any(parquet, arrow):file_format>')
+def export_columnar(file_format):
+    """Stream articles as a typed Parquet or Arrow file; ?content=1 adds article bodies"""
+    if not columnar_available():
+        flash(f'{file_format.title()} export needs pyarrow (pip install pyarrow)', 'error')
+        return redirect(url_for('export_page'))
+    
+    try:
+        collapse = request.args.get('collapse', '') == '1'
+        with_content = request.args.get('content', '') == '1'
+        chunks = columnar_chunks(file_format, with_content, collapse)
         
+        response = Response(stream_with_context(chunks), mimetype='application/octet-stream')
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename=sylheti_news_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{file_format}'
+        )
         return response
         
     except Exception as e:
-        logger.error(f"Error exporting JSON: {str(e)}")
-        flash(f'Error exporting JSON: {str(e)}', 'error')
+        logger.error(f"Error exporting {file_format}: {str(e)}")
+        flash(f'Error exporting {file_format}: {str(e)}', 'error')
         return redirect(url_for('export_page'))
 
+@app.route('/export/changes')
+def export_changes():
+    """Stream the articles added, deactivated or deleted after ?since=<seq>, in change order
+    
+    The response's X-Next-Cursor header (and next_cursor in the JSON format) is the
+    since value for the next call. ?format=ndjson|json|csv, ?limit=N and ?gzip=1 are
+    optional.
+    """
+    try:
+        since = max(request.args.get('since', 0, type=int), 0)
+        limit = max(request.args.get('limit', 0, type=int), 0)
+        export_format = request.args.get('format', 'ndjson')
+        compress = request.args.get('gzip', '') == '1'
+        
+        # Fix the window before streaming so the cursor can go out in a header
+        upto = change_window(since, limit)
+        query = changes_query(JSON_COLUMNS, since, upto).yield_per(app.config["EXPORT_BATCH_SIZE"])
+        headers = {'X-Next-Cursor': str(upto)}
+        
+        if export_format == 'csv':
+            pieces = csv_lines(query, header=CHANGE_CSV_HEADER, fields=change_csv_fields)
+            return export_response(pieces, 'changes CSV', 'csv', 'text/csv', compress, headers)
+        if export_format == 'json':
+            pieces = json_document(query, key='changes', to_dict=change_dict, since=since, next_cursor=upto)
+            return export_response(pieces, 'changes JSON', 'json', 'application/json', compress, headers)
+        pieces = ndjson_lines(query, to_dict=change_dict)
+        return export_response(pieces, 'changes NDJSON', 'ndjson', 'application/x-ndjson', compress, headers)
+        
+    except Exception as e:
+        logger.error(f"Error exporting changes: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/stats')
 def stats():
-    """Show scraping statistics"""
-    # Get article count by source
-    source_stats = db.session.query(
-        Article.source,
-        db.func.count(Article.id).label('count')
-    ).filter_by(is_active=True).group_by(Article.source).all()
-    
-    # Get recent scraping logs
-    recent_logs = ScrapingLog.query.order_by(ScrapingLog.timestamp.desc()).limit(10).all()
-    
-    # Get articles by date (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    daily_stats = db.session.query(
-        db.func.date(Article.scraped_date).label('date'),
-        db.func.count(Article.id).label('count')
-    ).filter(
-        Article.scraped_date >= thirty_days_ago,
-        Article.is_active == True
-    ).group_by(db.func.date(Article.scraped_date)).order_by('date').all()
-    
+    """Show scraping statistics from the daily rollups"""
+    days = request.args.get('days', 30, type=int)
+    if days not in STATS_WINDOWS:
+        days = STATS_WINDOWS[0]
+
+    # Active article totals come from the facet table, everything else from the rollups
+    facets = load_facets()
+    window = window_stats(days)
+    peak = max((count for _, count in window['daily']), default=0)
+
     return render_template('stats.html',
-                         source_stats=source_stats,
-                         recent_logs=recent_logs,
-                         daily_stats=daily_stats)
+                         days=days,
+                         windows=STATS_WINDOWS,
+                         source_stats=facets['sources'],
+                         total_articles=facets['total'],
+                         daily_stats=window['daily'],
+                         peak=peak,
+                         window=window)
 
 @app.route('/search')
 def search():
-    """Search articles"""
+    """Search articles, best matches first"""
     query = request.args.get('q', '')
+    page = request.args.get('page', 1, type=int)
     if not query:
         flash('Please enter a search term', 'warning')
         return redirect(url_for('index'))
     
-    # Search in title and content
-    articles = Article.query.filter(
-        db.or_(
-            Article.title.contains(query),
-            Article.content.contains(query)
-        ),
-        Article.is_active == True
-    ).order_by(Article.scraped_date.desc()).limit(50).all()
+    # Full-text match on title and content, ranked by relevance
+    articles = apply_search(
+        Article.query.filter(Article.is_active == True), query, ranked=True
+    ).paginate(page=page, per_page=20, error_out=False)
     
     return render_template('search_results.html', 
                          articles=articles, 
                          query=query,
-                         total_found=len(articles))
+                         total_found=articles.total)
 
 @app.errorhandler(404)
 def not_found(error):
@@ -1,8 +1,11 @@
 import schedule
-import time
 import threading
 import logging
-from scrapers import run_all_scrapers
+from datetime import datetime, timedelta
+from jobs import enqueue_job, job_pool
+from leader import LeaderElection
+from crawl_intervals import crawl_plan
+from scrapers import build_scrapers
 from app import app
 
 logger = logging.getLogger(__name__)
@@ -11,6 +14,15 @@ class NewsScraperScheduler:
     def __init__(self):
         self.running = False
         self.thread = None
+        self.sources = [scraper.source_name for scraper in build_scrapers()]
+        # When each source is next due; empty until this process leads
+        self.next_due = {}
+        # Whether the schedule's jobs were registered for the current term as leader
+        self.leading = False
+        # Set to end the loop's sleep early: on stop, or when the lease changes hands
+        self._wake = threading.Event()
+        # Every process may start the scheduler; only the lease holder runs its jobs
+        self.election = LeaderElection('scheduler', wake=self._wake)
     
     def start_scheduler(self):
         """Start the background scheduler"""
@@ -20,11 +32,12 @@ class NewsScraperScheduler:
         
         self.running = True
         
-        # Schedule scraping every 4 hours
-        schedule.every(4).hours.do(self.run_scraping_job)
+        # Scrapes run on the job workers; the schedule only queues them
+        job_pool.start()
+        self.election.start()
         
-        # Schedule daily cleanup at 2 AM
-        schedule.every().day.at("02:00").do(self.cleanup_old_articles)
+        # Sources are crawled at their own pace by run_due_sources; the
+        # schedule's jobs are registered when this process becomes the leader
         
         # Start the scheduler thread
         self.thread = threading.Thread(target=self.scheduler_loop, daemon=True)
@@ -35,53 +48,109 @@ class NewsScraperScheduler:
     def stop_scheduler(self):
         """Stop the scheduler"""
         self.running = False
+        self._wake.set()
         if self.thread:
             self.thread.join()
+        self.election.stop()
         logger.info("News scraper scheduler stopped")
     
+    def register_jobs(self):
+        """Schedule the periodic jobs afresh, counting from now"""
+        schedule.clear()
+        
+        # Schedule daily cleanup at 2 AM
+        schedule.every().day.at("02:00").do(self.cleanup_old_articles)
+        
+        # Index articles whose post-commit search indexing or fingerprinting failed
+        schedule.every().hour.do(self.catch_up_indexes)
+    
     def scheduler_loop(self):
-        """Main scheduler loop"""
+        """Main scheduler loop: sleep until the next source or scheduled job is due"""
         while self.running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            self._wake.clear()
+            # Followers sleep until the lease changes hands
+            self._wake.wait(self.step())
     
-    def run_scraping_job(self):
-        """Run the scraping job"""
-        logger.info("Starting scheduled scraping job")
+    def step(self):
+        """One pass of the loop; return the seconds to sleep, or None to wait for the lease"""
+        if not self.election.is_leader:
+            # Plan afresh from the scraping log if this process becomes the leader
+            self.next_due = {}
+            self.leading = False
+            return None
         
+        if not self.leading:
+            # Run times planned while following are stale; counting from the
+            # takeover avoids repeating a cleanup the old leader just ran
+            self.register_jobs()
+            self.leading = True
+        schedule.run_pending()
+        timeout = self.run_due_sources()
+        idle = schedule.idle_seconds()
+        if idle is not None:
+            timeout = min(timeout, idle)
+        return max(timeout, 1)
+    
+    def run_due_sources(self):
+        """Queue a scrape job for each source that is due; return the seconds until the next one is"""
+        now = datetime.utcnow()
         with app.app_context():
             try:
-                found, saved, errors = run_all_scrapers()
-                logger.info(f"Scheduled scraping completed: {found} found, {saved} saved")
+                if not self.next_due:
+                    self.next_due = {source: due for source, (_, due) in crawl_plan(self.sources, now).items()}
                 
-                if errors:
-                    logger.error(f"Scraping errors: {errors}")
+                due = [source for source, due_at in self.next_due.items() if due_at <= now]
+                if due:
+                    # Intervals follow each source's recent yield, so re-plan as sources come due
+                    plan = crawl_plan(self.sources, now)
+                    for source in due:
+                        job = enqueue_job(source=source)
+                        interval = plan[source][0]
+                        self.next_due[source] = now + timedelta(seconds=interval)
+                        logger.info(f"Queued job {job.id} for {source}; next crawl in {interval / 60:.0f} minutes")
                     
             except Exception as e:
-                logger.error(f"Error in scheduled scraping: {str(e)}")
+                logger.error(f"Error queueing scheduled scraping: {str(e)}")
+                return app.config["SCRAPER_MIN_INTERVAL"]
+        
+        if not self.next_due:
+            return app.config["SCRAPER_MIN_INTERVAL"]
+        return (min(self.next_due.values()) - datetime.utcnow()).total_seconds()
     
     def cleanup_old_articles(self):
-        """Clean up old articles (older than 30 days)"""
+        """Delete or archive expired articles in batches"""
         logger.info("Starting cleanup of old articles")
         
         with app.app_context():
             try:
-                from models import Article
-                from datetime import datetime, timedelta
-                from app import db
-                
-                thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-                old_articles = Article.query.filter(Article.scraped_date < thirty_days_ago).all()
+                from retention import apply_retention
+                from facets import rebuild_facets
                 
-                for article in old_articles:
-                    db.session.delete(article)
+                report = apply_retention()
+                rows = sum(batch['rows'] for batch in report)
+                seconds = sum(batch['seconds'] for batch in report)
+                logger.info(f"Cleaned up {rows} old articles in {len(report)} batches ({seconds:.1f}s)")
                 
-                db.session.commit()
-                logger.info(f"Cleaned up {len(old_articles)} old articles")
+                if report:
+                    rebuild_facets()
                 
             except Exception as e:
                 logger.error(f"Error in cleanup: {str(e)}")
-                db.session.rollback()
+
+    def catch_up_indexes(self):
+        """Add stored articles missing from the search index or fingerprints"""
+        with app.app_context():
+            try:
+                from fulltext import sync_index
+                from fingerprints import backfill
+                
+                indexed = sync_index()
+                fingerprinted = backfill()
+                if indexed or fingerprinted:
+                    logger.info(f"Caught up {indexed} search index rows and {fingerprinted} fingerprints")
+                
+            except Exception as e:
+                logger.error(f"Error catching up indexes: {str(e)}")
 
 # Global scheduler instance
 scheduler = NewsScraperScheduler()
@@ -0,0 +1,81 @@
+import time
+from app import db
+from models import Article, ArticleFingerprint, DailyArticleCount
+from article_writer import ArticleWriter
+from fulltext import apply_search
+from retention import expire_batch
+
+def test_batches_skip_duplicate_urls_and_index_what_was_saved(app, make_row):
+    with ArticleWriter(batch_size=2) as writer:
+        writer.add(make_row('https://example.com/1'))
+        writer.add(make_row('https://example.com/2', title='Tea garden workers demand higher wages in Moulvibazar'))
+        writer.add(make_row('https://example.com/1'))
+    assert writer.saved == 2
+    assert writer.errors == []
+    assert Article.query.count() == 2
+
+    # Post-commit work: fingerprints, search index and the daily rollup
+    assert ArticleFingerprint.query.count() == 2
+    found = apply_search(Article.query, 'wages').all()
+    assert [article.url for article in found] == ['https://example.com/2']
+    assert db.session.query(db.func.sum(DailyArticleCount.count)).scalar() == 2
+
+def test_near_duplicates_join_one_cluster(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/a', source='The Daily Star'))
+        writer.add(make_row('https://example.com/b', source='Dhaka Tribune'))
+    clusters = {fingerprint.cluster_id for fingerprint in ArticleFingerprint.query}
+    assert len(clusters) == 1
+
+def test_flush_interval_flushes_before_the_batch_is_full(app, make_row):
+    writer = ArticleWriter(batch_size=100, flush_interval=0.01)
+    time.sleep(0.02)
+    writer.add(make_row('https://example.com/1'))
+    assert Article.query.count() == 1
+    assert writer.flush() == 0
+
+def test_collapsing_picks_the_representative_among_filtered_articles(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/a', source='The Daily Star'))
+        writer.add(make_row('https://example.com/b', source='Dhaka Tribune'))
+        writer.add(make_row('https://example.com/c', title='Tea garden workers demand higher wages in Moulvibazar'))
+    client = app.test_client()
+
+    urls = [article['url'] for article in client.get('/api/articles?collapse=1').get_json()['articles']]
+    assert sorted(urls) == ['https://example.com/a', 'https://example.com/c']
+
+    # The earlier copy is filtered out, so the other source's copy stands for the story
+    body = client.get('/api/articles?collapse=1&source=Dhaka+Tribune').get_json()
+    assert [article['url'] for article in body['articles']] == ['https://example.com/b']
+    assert body['count'] == 1
+
+    export = client.get('/export/json?collapse=1').get_json()
+    assert sorted(article['url'] for article in export['articles']) == sorted(urls)
+
+def test_a_bad_row_only_loses_itself(app, make_row):
+    writer = ArticleWriter(batch_size=3)
+    writer.add(make_row('https://example.com/1'))
+    writer.add(make_row('https://example.com/bad', title=None))
+    writer.add(make_row('https://example.com/2', title='Tea garden workers demand higher wages in Moulvibazar'))
+    assert writer.saved == 2
+    assert writer.failed_urls == ['https://example.com/bad']
+    assert len(writer.errors) == 1
+    assert sorted(url for url, in db.session.query(Article.url)) == ['https://example.com/1', 'https://example.com/2']
+    # The saved rows were indexed after their commit like any other batch
+    assert ArticleFingerprint.query.count() == 2
+
+def test_the_next_article_represents_a_cluster_after_its_first_is_gone(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/a', source='The Daily Star', category='Politics'))
+        writer.add(make_row('https://example.com/b', source='Dhaka Tribune', category='National'))
+    client = app.test_client()
+
+    # The stored representative is filtered out by the category, so its copy stands in
+    body = client.get('/api/articles?collapse=1&category=National').get_json()
+    assert [article['url'] for article in body['articles']] == ['https://example.com/b']
+
+    expire_batch([Article.query.filter_by(url='https://example.com/a').one().id])
+    representatives = [fingerprint.article_id for fingerprint in ArticleFingerprint.query.filter_by(representative=True)]
+    assert representatives == [Article.query.filter_by(url='https://example.com/b').one().id]
+    body = client.get('/api/articles?collapse=1').get_json()
+    assert [article['url'] for article in body['articles']] == ['https://example.com/b']
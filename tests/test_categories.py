@@ -0,0 +1,19 @@
+from categories import BANGLA_CLASSIFIER, ENGLISH_CLASSIFIER
+
+# খেলোয়াড় (player) with a precomposed o-sign and ya, then with both decomposed
+PLAYER_COMPOSED = '\u0996\u09c7\u09b2\u09cb\u09df\u09be\u09dc'
+PLAYER_DECOMPOSED = '\u0996\u09c7\u09b2\u09c7\u09be\u09af\u09bc\u09be\u09a1\u09bc'
+# ক্রিকেট (cricket) with a zero-width joiner after the virama
+CRICKET_ZWJ = '\u0995\u09cd\u200d\u09b0\u09bf\u0995\u09c7\u099f'
+
+def test_english_keywords_ignore_case():
+    assert ENGLISH_CLASSIFIER.from_text('The CRICKET match went on') == 'sports'
+    assert ENGLISH_CLASSIFIER.from_url('https://example.com/Technology/some-story') == 'technology'
+
+def test_bangla_keywords_match_any_unicode_spelling():
+    for player in (PLAYER_COMPOSED, PLAYER_DECOMPOSED):
+        assert BANGLA_CLASSIFIER.from_text(f'{player} {CRICKET_ZWJ}') == 'sports'
+
+def test_too_few_hits_is_no_category():
+    assert BANGLA_CLASSIFIER.from_text(PLAYER_DECOMPOSED) is None
+    assert ENGLISH_CLASSIFIER.from_text('') is None
@@ -0,0 +1,74 @@
+import threading
+import pytest
+from app import db
+from models import Article, ArticleChange
+from article_writer import ArticleWriter
+from changelog import ADDED, DEACTIVATED, DELETED, change_window, changes_query
+
+def changes():
+    return [(change.article_id, change.change) for change in ArticleChange.query.order_by(ArticleChange.seq)]
+
+def test_inserts_deactivations_and_deletes_are_logged(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1'))
+        writer.add(make_row('https://example.com/2', title='Tea garden workers demand higher wages'))
+    first, second = Article.query.order_by(Article.id).all()
+
+    first.is_active = False
+    db.session.commit()
+    first.is_active = True
+    db.session.commit()
+    db.session.delete(second)
+    db.session.commit()
+
+    assert changes() == [
+        (first.id, ADDED), (second.id, ADDED), (first.id, DEACTIVATED), (first.id, ADDED), (second.id, DELETED),
+    ]
+
+def test_change_window_pages_through_the_log(app, make_row):
+    with ArticleWriter() as writer:
+        for index in range(5):
+            writer.add(make_row(f'https://example.com/{index}', title=f'Story number {index} from the district'))
+    seqs = [change.seq for change in ArticleChange.query.order_by(ArticleChange.seq)]
+
+    assert change_window(0, limit=2) == seqs[1]
+    assert change_window(seqs[1]) == seqs[-1]
+    # Nothing new after the last change
+    assert change_window(seqs[-1]) == seqs[-1]
+
+    rows = changes_query([ArticleChange.seq, Article.title], seqs[1], seqs[3]).all()
+    assert [row.seq for row in rows] == seqs[2:4]
+
+def insert_article(connection, url):
+    connection.execute(Article.__table__.insert().values(title='Story', url=url, source='The Daily Star', is_active=True))
+
+def write_second(engine):
+    with engine.connect() as second:
+        insert_article(second, 'https://example.com/second')
+        second.commit()
+
+def test_a_later_seq_never_commits_before_an_earlier_one(app):
+    if db.engine.dialect.name != 'postgresql':
+        pytest.skip("SQLite allows one writer at a time; set TEST_DATABASE_URL to a Postgres database")
+
+    first = db.engine.connect()
+    writer = threading.Thread(target=write_second, args=(db.engine,))
+    try:
+        insert_article(first, 'https://example.com/first')
+        # A second writer starting while the first is still open
+        writer.start()
+        writer.join(0.5)
+
+        # It waits for the first, so no seq past the open one is visible yet
+        assert writer.is_alive()
+        assert change_window(0) == 0
+        db.session.rollback()
+        first.commit()
+    finally:
+        first.close()
+        if writer.ident:
+            writer.join()
+
+    urls = [url for url, in db.session.query(Article.url).join(
+        ArticleChange, ArticleChange.article_id == Article.id).order_by(ArticleChange.seq)]
+    assert urls == ['https://example.com/first', 'https://example.com/second']
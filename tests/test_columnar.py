@@ -0,0 +1,46 @@
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from article_writer import ArticleWriter
+from columnar import write_snapshot
+
+SOURCES = ['The Daily Star', 'Dhaka Tribune', 'bdnews24.com']
+
+@pytest.fixture
+def articles(app, make_row, monkeypatch):
+    """Five articles over three batches, with sources and categories first seen in later batches"""
+    monkeypatch.setitem(app.config, 'EXPORT_ROW_GROUP_SIZE', 2)
+    with ArticleWriter() as writer:
+        for index in range(5):
+            writer.add(make_row(f'https://example.com/{index}', title=f'Story number {index} from the district',
+                                source=SOURCES[index % 3], category=None if index == 2 else f'Section {index // 2}'))
+
+def check(table):
+    assert table.num_rows == 5
+    rows = sorted(zip(table.column('id').to_pylist(), table.column('source').to_pylist(),
+                      table.column('category').to_pylist()))
+    assert [(source, category) for _, source, category in rows] == [
+        ('The Daily Star', 'Section 0'), ('Dhaka Tribune', 'Section 0'), ('bdnews24.com', None),
+        ('The Daily Star', 'Section 1'), ('Dhaka Tribune', 'Section 2'),
+    ]
+    assert pa.types.is_dictionary(table.schema.field('source').type)
+
+@pytest.mark.parametrize('extension', ['arrow', 'feather'])
+def test_arrow_snapshots_are_feather_files(articles, tmp_path, extension):
+    path = str(tmp_path / f'articles.{extension}')
+    assert write_snapshot(path, 'arrow') == 5
+    check(feather.read_table(path))
+    check(pa.ipc.open_file(path).read_all())
+
+def test_parquet_snapshot(articles, tmp_path):
+    path = str(tmp_path / 'articles.parquet')
+    assert write_snapshot(path, 'parquet') == 5
+    check(pq.read_table(path))
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+def test_the_arrow_download_is_an_ipc_file(articles, app):
+    response = app.test_client().get('/export/arrow')
+    assert response.status_code == 200
+    check(pa.ipc.open_file(pa.BufferReader(response.data)).read_all())
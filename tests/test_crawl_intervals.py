@@ -0,0 +1,12 @@
+from crawl_intervals import yield_interval
+
+def test_interval_matches_the_target_yield(app, monkeypatch):
+    monkeypatch.setitem(app.config, "SCRAPER_TARGET_YIELD", 5)
+    # 10 articles an hour: 5 articles every 30 minutes
+    assert yield_interval(10, 3600) == 1800
+
+def test_interval_is_clamped(app):
+    low, high = app.config["SCRAPER_MIN_INTERVAL"], app.config["SCRAPER_MAX_INTERVAL"]
+    assert yield_interval(10000, 3600) == low
+    assert yield_interval(1, 7 * 24 * 3600) == high
+    assert yield_interval(0, 3600) == high
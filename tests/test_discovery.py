@@ -0,0 +1,50 @@
+from datetime import datetime
+from discovery import parse_feed, feed_root, parse_datetime
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>News</title>
+<item><title>One</title><link>https://example.com/news/1</link><pubDate>Mon, 02 Mar 2026 10:00:00 +0600</pubDate></item>
+<item><title>No link</title></item>
+<item><title>Two</title><guid>https://example.com/news/2</guid></item>
+</channel></rss>"""
+
+ATOM = """<feed xmlns="http://www.w3.org/2005/Atom">
+<entry><link rel="self" href="https://example.com/self"/><link href="https://example.com/a"/>
+<published>2026-03-02T04:00:00Z</published></entry>
+</feed>"""
+
+SITEMAP_INDEX = """<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<sitemap><loc>https://example.com/sitemap-1.xml</loc></sitemap>
+<sitemap><loc>https://example.com/sitemap-2.xml</loc></sitemap>
+</sitemapindex>"""
+
+def test_rss_items():
+    links, sitemaps = parse_feed(RSS)
+    assert [link.url for link in links] == ['https://example.com/news/1', 'https://example.com/news/2']
+    assert links[0].published == datetime(2026, 3, 2, 4, 0)
+    assert sitemaps == []
+
+def test_atom_entries_use_the_alternate_link():
+    links, _ = parse_feed(ATOM)
+    assert links == [(('https://example.com/a'), datetime(2026, 3, 2, 4, 0))]
+
+def test_sitemap_index_lists_child_sitemaps():
+    links, sitemaps = parse_feed(SITEMAP_INDEX)
+    assert links == []
+    assert sitemaps == ['https://example.com/sitemap-1.xml', 'https://example.com/sitemap-2.xml']
+
+def test_feed_root_and_dates():
+    assert feed_root(RSS) == 'rss'
+    assert feed_root('<!DOCTYPE html><html></html>') is None
+    assert parse_datetime('garbage') is None
+
+def test_child_sitemaps_are_newest_first():
+    index = """<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+<sitemap><loc>https://example.com/2019.xml</loc><lastmod>2019-12-31</lastmod></sitemap>
+<sitemap><loc>https://example.com/undated.xml</loc></sitemap>
+<sitemap><loc>https://example.com/2026.xml</loc><lastmod>2026-03-01T00:00:00+06:00</lastmod></sitemap>
+<sitemap><loc>https://example.com/2024.xml</loc><lastmod>2024-06-01</lastmod></sitemap>
+</sitemapindex>"""
+    _, sitemaps = parse_feed(index)
+    assert sitemaps == ['https://example.com/2026.xml', 'https://example.com/2024.xml',
+                        'https://example.com/2019.xml', 'https://example.com/undated.xml']
@@ -0,0 +1,13 @@
+import pytest
+from exports import export_response
+
+def failing_rows():
+    yield 'first row\n'
+    raise RuntimeError('database went away')
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_an_error_mid_stream_aborts_the_response(app, compress):
+    with app.test_request_context():
+        response = export_response(failing_rows(), 'CSV', 'csv', 'text/csv', compress)
+        with pytest.raises(RuntimeError, match='database went away'):
+            b''.join(response.response)
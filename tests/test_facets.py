@@ -0,0 +1,31 @@
+from app import db
+from models import Article
+from article_writer import ArticleWriter
+from facets import rebuild_facets, load_facets
+
+def test_facets_count_active_articles_per_source_and_category(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1', source='The Daily Star', category='Politics'))
+        writer.add(make_row('https://example.com/2', title='Tea garden workers demand higher wages',
+                            source='Dhaka Tribune', category='Business'))
+        writer.add(make_row('https://example.com/3', title='New bridge over the Surma opens next month',
+                            source='Dhaka Tribune', category=''))
+        writer.add(make_row('https://example.com/4', title='An old story that has since been withdrawn',
+                            source='Dhaka Tribune', category='Politics'))
+    Article.query.filter_by(url='https://example.com/4').update({'is_active': False})
+    db.session.commit()
+
+    # Built on first use
+    assert load_facets() == {
+        'sources': [('Dhaka Tribune', 2), ('The Daily Star', 1)],
+        'categories': [('Business', 1), ('Politics', 1)],
+        'total': 3,
+    }
+
+def test_facets_are_cached_until_rebuilt(app, make_row):
+    assert load_facets()['total'] == 0
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1'))
+    assert load_facets()['total'] == 0
+    rebuild_facets()
+    assert load_facets()['total'] == 1
@@ -0,0 +1,26 @@
+from fingerprints import BANDS, MAX_DISTANCE, simhash, hamming, bands, to_signed
+
+STORY = ("Heavy rain caused flash floods across Sylhet on Monday, cutting off roads to several "
+         "upazilas and forcing hundreds of families into shelters, officials said")
+
+def test_simhash_is_stable_and_close_for_near_duplicates():
+    assert simhash(STORY) == simhash(STORY)
+    edited = STORY.replace('Monday', 'Tuesday')
+    assert hamming(simhash(STORY), simhash(edited)) < hamming(simhash(STORY), simhash(STORY[::-1]))
+
+def test_short_texts_have_no_fingerprint():
+    assert simhash('Too short to fingerprint') is None
+    assert simhash(None) is None
+
+def test_fingerprints_within_max_distance_share_a_band():
+    fingerprint = simhash(STORY)
+    # Flip MAX_DISTANCE bits spread over different bands
+    flipped = fingerprint ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+    assert hamming(fingerprint, flipped) == MAX_DISTANCE
+    assert any(a == b for a, b in zip(bands(fingerprint), bands(flipped)))
+    assert len(bands(fingerprint)) == BANDS
+
+def test_to_signed_fits_a_bigint():
+    assert to_signed(0) == 0
+    assert to_signed((1 << 64) - 1) == -1
+    assert -(1 << 63) <= to_signed(1 << 63) < 0
@@ -0,0 +1,35 @@
+from app import db
+from models import Article, ArticleFingerprint
+from article_writer import ArticleWriter
+from fulltext import apply_search, sync_index, article_fts, article_search, dialect
+from fingerprints import backfill
+
+def save(make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1', title='Tea garden workers demand higher wages in Moulvibazar'))
+        writer.add(make_row('https://example.com/2'))
+        writer.add(make_row('https://example.com/3', title='New bridge over the Surma opens to traffic next month'))
+
+def test_sync_index_fills_gaps_below_the_newest_indexed_article(app, make_row):
+    save(make_row)
+    # As if indexing the batch holding the first article had failed after its commit
+    first = db.session.query(db.func.min(Article.id)).scalar()
+    if dialect() == 'sqlite':
+        db.session.execute(article_fts.delete().where(article_fts.c.rowid == first))
+    else:
+        db.session.execute(article_search.delete().where(article_search.c.article_id == first))
+    db.session.commit()
+    assert apply_search(Article.query, 'wages').count() == 0
+
+    assert sync_index() == 1
+    assert apply_search(Article.query, 'wages').count() == 1
+    assert sync_index() == 0
+
+def test_fingerprint_backfill_covers_unfingerprinted_articles(app, make_row):
+    save(make_row)
+    first = db.session.query(db.func.min(Article.id)).scalar()
+    ArticleFingerprint.query.filter_by(article_id=first).delete()
+    db.session.commit()
+
+    assert backfill() == 1
+    assert ArticleFingerprint.query.count() == 3
@@ -0,0 +1,40 @@
+import os
+import time
+import requests
+from http_cache import ResponseCache
+
+def response(body, **headers):
+    result = requests.Response()
+    result.status_code = 200
+    result.encoding = 'utf-8'
+    result._content = body.encode('utf-8')
+    result.headers.update(headers)
+    return result
+
+def test_validators_become_conditional_headers(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10 ** 6, max_age=3600)
+    cache.store('https://example.com/', response('<html>v1</html>', ETag='"v1"', **{'Last-Modified': 'Mon, 02 Mar 2026 10:00:00 GMT'}))
+    assert cache.conditional_headers('https://example.com/') == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 02 Mar 2026 10:00:00 GMT',
+    }
+    assert cache.not_modified('https://example.com/') == '<html>v1</html>'
+
+def test_pages_without_validators_are_not_kept(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10 ** 6, max_age=3600)
+    cache.store('https://example.com/', response('<html></html>'))
+    assert cache.conditional_headers('https://example.com/') == {}
+    assert cache.not_modified('https://example.com/') is None
+
+def test_eviction_drops_the_oldest_entries_first(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10 ** 6, max_age=3600)
+    for index in range(3):
+        cache.store(f'https://example.com/{index}', response('x' * 1000, ETag=f'"{index}"'))
+    now = time.time()
+    for index, age in enumerate((7200, 20, 10)):
+        os.utime(cache.path_for(f'https://example.com/{index}'), (now - age, now - age))
+    assert cache.evict() == 1
+
+    cache.max_bytes = 1500
+    assert cache.evict() == 1
+    assert cache.get('https://example.com/1') is None
+    assert cache.get('https://example.com/2') is not None
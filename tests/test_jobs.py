@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from models import ScrapeJob
+from jobs import PENDING, RUNNING, DONE, FAILED, enqueue_job, claim_job, requeue_stale_jobs
+
+def test_identical_pending_jobs_are_shared(app):
+    first = enqueue_job()
+    assert enqueue_job().id == first.id
+    assert enqueue_job(source='Daily Sylhet').id != first.id
+    assert enqueue_job(mode='backfill').id != first.id
+    assert ScrapeJob.query.count() == 3
+
+def test_unknown_sources_and_modes_are_rejected(app):
+    with pytest.raises(ValueError):
+        enqueue_job(source='Nowhere Times')
+    with pytest.raises(ValueError):
+        enqueue_job(mode='everything')
+
+def test_jobs_are_claimed_once_in_order(app):
+    first = enqueue_job(source='Daily Sylhet')
+    second = enqueue_job(source='Dhaka Tribune')
+
+    claimed = claim_job('worker-1')
+    assert (claimed.id, claimed.status, claimed.worker) == (first.id, RUNNING, 'worker-1')
+    assert claim_job('worker-2').id == second.id
+    assert claim_job('worker-3') is None
+
+def test_jobs_overlapping_a_running_job_wait(app):
+    everything = enqueue_job()
+    claim_job('worker-1')
+    # A click after the crawl started queues the same work again
+    again = enqueue_job()
+    sylhet = enqueue_job(source='Daily Sylhet')
+    assert claim_job('worker-2') is None
+
+    ScrapeJob.query.filter_by(id=everything.id).update({'status': DONE})
+    db.session.commit()
+    assert claim_job('worker-2').id == again.id
+    assert claim_job('worker-3') is None
+    ScrapeJob.query.filter_by(id=again.id).update({'status': DONE})
+    db.session.commit()
+    assert claim_job('worker-3').id == sylhet.id
+
+def test_per_source_jobs_block_only_their_source_and_everything(app):
+    sylhet = enqueue_job(source='Daily Sylhet')
+    claim_job('worker-1')
+    backfill = enqueue_job(source='Daily Sylhet', mode='backfill')
+    everything = enqueue_job()
+    tribune = enqueue_job(source='Dhaka Tribune')
+
+    assert claim_job('worker-2').id == tribune.id
+    assert claim_job('worker-3') is None
+    ScrapeJob.query.filter(ScrapeJob.id.in_([sylhet.id, tribune.id])).update({'status': DONE})
+    db.session.commit()
+    assert claim_job('worker-3').id == backfill.id
+    assert db.session.get(ScrapeJob, everything.id).status == PENDING
+
+def test_stale_running_jobs_are_requeued(app):
+    job = enqueue_job(source='Daily Sylhet')
+    claim_job('worker-1')
+    ScrapeJob.query.filter_by(id=job.id).update({'heartbeat_at': datetime.utcnow() - timedelta(hours=2)})
+    db.session.commit()
+
+    requeue_stale_jobs()
+    db.session.expire_all()
+    assert db.session.get(ScrapeJob, job.id).status == PENDING
+
+def test_stale_job_with_an_identical_pending_job_fails(app):
+    job = enqueue_job(source='Daily Sylhet')
+    claim_job('worker-1')
+    ScrapeJob.query.filter_by(id=job.id).update({'heartbeat_at': datetime.utcnow() - timedelta(hours=2)})
+    db.session.commit()
+    waiting = enqueue_job(source='Daily Sylhet')
+
+    requeue_stale_jobs()
+    db.session.expire_all()
+    assert db.session.get(ScrapeJob, job.id).status == FAILED
+    assert db.session.get(ScrapeJob, waiting.id).status == PENDING
+
+def test_job_status_api(app):
+    job = enqueue_job(source='Daily Sylhet')
+    client = app.test_client()
+
+    response = client.get(f'/api/jobs/{job.id}')
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert (data['status'], data['source'], data['progress']['sources_done']) == (PENDING, 'Daily Sylhet', 0)
+    assert client.get('/api/jobs/999999').status_code == 404
@@ -0,0 +1,79 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import schedule
+from app import db
+from models import SchedulerLease
+from leader import RowLease, LeaderElection
+from scheduler import NewsScraperScheduler
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+def test_row_lease_is_held_by_one_process_until_it_expires(app):
+    first = RowLease('scheduler', 'first', ttl=60)
+    second = RowLease('scheduler', 'second', ttl=60)
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.renew()
+    assert first.acquire()
+
+    # The holder stopped renewing
+    SchedulerLease.query.update({'expires_at': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+    assert second.acquire()
+    assert not first.renew()
+    assert not first.acquire()
+
+    second.release()
+    assert first.acquire()
+
+def test_leadership_fails_over_when_the_leader_stops(app):
+    first_wake, second_wake = threading.Event(), threading.Event()
+    first = LeaderElection('test-scheduler', ttl=0.3, wake=first_wake)
+    second = LeaderElection('test-scheduler', ttl=0.3, wake=second_wake)
+    try:
+        first.start()
+        assert wait_for(lambda: first.is_leader)
+        assert first_wake.is_set()
+        second.start()
+        time.sleep(0.3)
+        assert not second.is_leader
+
+        first.stop()
+        assert not first.is_leader
+        assert wait_for(lambda: second.is_leader)
+        assert second_wake.is_set()
+    finally:
+        first.stop()
+        second.stop()
+
+def test_jobs_are_rescheduled_when_leadership_is_gained(app, monkeypatch):
+    cleanups = []
+    scheduler = NewsScraperScheduler()
+    monkeypatch.setattr(scheduler, 'cleanup_old_articles', lambda: cleanups.append(datetime.now()))
+    monkeypatch.setattr(scheduler, 'run_due_sources', lambda: 600)
+    try:
+        scheduler.election._leader.set()
+        assert scheduler.step() <= 600
+        assert len(schedule.get_jobs()) == 2
+
+        # While following, the cleanup's run time goes stale
+        scheduler.election._leader.clear()
+        assert scheduler.step() is None
+        cleanup = next(job for job in schedule.get_jobs() if job.at_time is not None)
+        cleanup.next_run = datetime.now() - timedelta(days=3)
+
+        # Taking over later does not run the stale cleanup at once
+        scheduler.election._leader.set()
+        scheduler.step()
+        assert cleanups == []
+        assert len(schedule.get_jobs()) == 2
+        assert all(job.next_run > datetime.now() for job in schedule.get_jobs())
+    finally:
+        schedule.clear()
@@ -0,0 +1,60 @@
+from datetime import datetime
+from types import SimpleNamespace
+from app import db
+from models import Article
+from pagination import CountCache, encode_cursor, decode_cursor, keyset_page
+
+def test_cursor_round_trip():
+    article = SimpleNamespace(id=42, scraped_date=datetime(2026, 3, 1, 12, 30, 5, 123456))
+    token = encode_cursor(article)
+    assert '=' not in token
+    assert decode_cursor(token) == (article.scraped_date, 42)
+
+def test_invalid_cursors_are_ignored():
+    assert decode_cursor(None) is None
+    assert decode_cursor('') is None
+    assert decode_cursor('not a cursor!') is None
+    assert decode_cursor('bm90aGluZw') is None
+
+class CountingQuery:
+    """Stand-in for a query that records how often it was counted"""
+
+    def __init__(self, count):
+        self.value = count
+        self.counted = 0
+
+    def order_by(self, *columns):
+        return self
+
+    def count(self):
+        self.counted += 1
+        return self.value
+
+def test_count_cache_keeps_only_the_most_recently_used_counts():
+    cache = CountCache(ttl=60, max_entries=2)
+    queries = {key: CountingQuery(index) for index, key in enumerate('abc')}
+    assert cache.get('a', queries['a']) == 0
+    cache.get('b', queries['b'])
+    cache.get('a', queries['a'])
+    cache.get('c', queries['c'])
+    # 'b' was the least recently used when 'c' came in
+    cache.get('a', queries['a'])
+    cache.get('b', queries['b'])
+    assert (queries['a'].counted, queries['b'].counted) == (1, 2)
+
+def test_pages_skip_articles_without_a_scrape_date(app):
+    db.session.add_all([
+        Article(title=f'Story {index}', url=f'https://example.com/{index}', source='The Daily Star',
+                scraped_date=datetime(2026, 3, index))
+        for index in range(1, 4)
+    ])
+    db.session.add(Article(title='Undated', url='https://example.com/undated', source='The Daily Star'))
+    db.session.commit()
+    Article.query.filter_by(title='Undated').update({'scraped_date': None})
+    db.session.commit()
+
+    first = keyset_page(Article.query, per_page=2)
+    assert [article.title for article in first.items] == ['Story 3', 'Story 2']
+    second = keyset_page(Article.query, per_page=2, after=decode_cursor(first.next_cursor))
+    assert [article.title for article in second.items] == ['Story 1']
+    assert second.next_cursor is None
@@ -0,0 +1,47 @@
+import pytest
+from ratelimit import TokenBucket, parse_retry_after
+
+def make_bucket(rate=2.0, burst=2):
+    return TokenBucket(rate=rate, burst=burst, min_rate=0.5, max_rate=4.0, target_latency=1.0)
+
+def test_burst_is_free_then_callers_are_spaced_at_the_rate():
+    bucket = make_bucket()
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5, abs=0.01)
+    assert waits[3] == pytest.approx(1.0, abs=0.01)
+
+def test_observe_adapts_the_rate_within_bounds():
+    bucket = make_bucket()
+    bucket.observe(0.1, status=429)
+    assert bucket.rate == 1.0
+    bucket.observe(5.0)
+    assert bucket.rate == 0.75
+    bucket.observe(5.0)
+    assert bucket.rate == 0.5625
+    bucket.observe(5.0)
+    assert bucket.rate == 0.5
+    for _ in range(100):
+        bucket.observe(0.1)
+    assert bucket.rate == 4.0
+
+def test_parse_retry_after():
+    assert parse_retry_after('30') == 30.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+def test_callers_after_a_pause_keep_their_spacing():
+    bucket = make_bucket()
+    bucket.pause(10)
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == [pytest.approx(10, abs=0.01), pytest.approx(10.5, abs=0.01), pytest.approx(11, abs=0.01)]
+
+def test_a_short_pause_does_not_shorten_an_existing_queue():
+    bucket = make_bucket()
+    for _ in range(6):
+        bucket.reserve()
+    bucket.pause(0.1)
+    # Four callers were already queued behind the burst; the next one is still fifth in line
+    assert bucket.reserve() == pytest.approx(2.5, abs=0.01)
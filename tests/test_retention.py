@@ -0,0 +1,73 @@
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+from models import Article, ArticleArchive, ArticleFingerprint
+from article_writer import ArticleWriter
+import retention
+from app import parse_days_by_source
+from retention import apply_retention
+
+def add_articles(make_row, count, source, days_old):
+    scraped = datetime.utcnow() - timedelta(days=days_old)
+    with ArticleWriter() as writer:
+        for index in range(count):
+            writer.add(make_row(f'https://example.com/{source}/{days_old}/{index}',
+                                title=f'Story {index} of {days_old} days ago from {source} about local news',
+                                source=source, scraped_date=scraped))
+
+def test_expired_articles_are_deleted_in_batches(app, make_row):
+    add_articles(make_row, 5, 'The Daily Star', days_old=40)
+    add_articles(make_row, 2, 'The Daily Star', days_old=1)
+
+    report = apply_retention(archive='', batch_size=2)
+    assert [batch['rows'] for batch in report] == [2, 2, 1]
+    assert all(batch['seconds'] >= 0 for batch in report)
+    assert Article.query.count() == 2
+    # Fingerprints go with their articles
+    assert ArticleFingerprint.query.count() == 2
+
+def test_sources_can_keep_articles_longer(app, make_row, monkeypatch):
+    monkeypatch.setitem(app.config, "RETENTION_DAYS_BY_SOURCE", {'Daily Sylhet': 90})
+    add_articles(make_row, 3, 'Daily Sylhet', days_old=40)
+    add_articles(make_row, 3, 'The Daily Star', days_old=40)
+
+    apply_retention(archive='')
+    assert {article.source for article in Article.query} == {'Daily Sylhet'}
+
+def test_archive_table_keeps_a_compressed_copy(app, make_row):
+    add_articles(make_row, 3, 'The Daily Star', days_old=40)
+    apply_retention(archive='table')
+
+    assert Article.query.count() == 0
+    archived = ArticleArchive.query.order_by(ArticleArchive.article_id).all()
+    assert len(archived) == 3
+    data = json.loads(zlib.decompress(archived[0].data))
+    assert data['source'] == 'The Daily Star'
+    assert data['url'].startswith('https://example.com/')
+
+def test_days_by_source_from_the_environment():
+    assert parse_days_by_source('') == {}
+    assert parse_days_by_source('Daily Sylhet=90, Sylhet Today = 60') == {'Daily Sylhet': 90, 'Sylhet Today': 60}
+    assert parse_days_by_source('{"Daily Sylhet": 90}') == {'Daily Sylhet': 90}
+
+def test_archive_file_only_appears_once_the_batch_commits(app, make_row, monkeypatch):
+    directory = app.config["RETENTION_ARCHIVE_DIR"]
+    add_articles(make_row, 3, 'The Daily Star', days_old=40)
+
+    def fail(clusters):
+        raise RuntimeError('database is locked')
+    monkeypatch.setattr(retention, 'elect_representatives', fail)
+    assert apply_retention(archive='file') == []
+    assert Article.query.count() == 3
+    assert not os.path.isdir(directory) or os.listdir(directory) == []
+
+    # The retried batch is archived exactly once
+    monkeypatch.undo()
+    apply_retention(archive='file')
+    assert Article.query.count() == 0
+    files = os.listdir(directory)
+    assert len(files) == 1 and files[0].endswith('.ndjson.gz')
+    with gzip.open(os.path.join(directory, files[0]), 'rt', encoding='utf-8') as archive:
+        assert len([json.loads(line) for line in archive]) == 3
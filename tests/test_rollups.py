@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from app import db
+from models import Article, ScrapingLog, DailyArticleCount
+from article_writer import ArticleWriter
+from rollups import record_articles, record_scrape, rebuild_rollups, window_stats
+
+def test_saved_articles_are_counted_per_day_source_and_category(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1', category='Politics'))
+        writer.add(make_row('https://example.com/2', title='Tea garden workers demand higher wages', category='Politics'))
+        writer.add(make_row('https://example.com/3', title='New bridge over the Surma opens next month',
+                            source='Dhaka Tribune'))
+
+    today = datetime.utcnow().date()
+    rows = {(row.day, row.source, row.category): row.count for row in DailyArticleCount.query}
+    assert rows == {(today, 'The Daily Star', 'Politics'): 2, (today, 'Dhaka Tribune', ''): 1}
+
+    # Later saves add onto the existing row
+    record_articles([(datetime.utcnow(), 'Dhaka Tribune', None)])
+    assert db.session.get(DailyArticleCount, (today, 'Dhaka Tribune', '')).count == 2
+
+def test_window_stats_reads_the_rollups(app):
+    now = datetime.utcnow()
+    record_articles([(now, 'The Daily Star', 'Politics'), (now, 'Dhaka Tribune', 'Politics'),
+                     (now - timedelta(days=1), 'Dhaka Tribune', ''),
+                     (now - timedelta(days=45), 'Dhaka Tribune', 'Sports')])
+    for success, found, saved in ((True, 10, 4), (False, 0, 0)):
+        record_scrape(ScrapingLog(source='Dhaka Tribune', timestamp=now, success=success,
+                                  articles_found=found, articles_saved=saved))
+
+    stats = window_stats(30)
+    assert stats['since'] == now.date() - timedelta(days=29)
+    assert stats['daily'] == [(now.date() - timedelta(days=1), 1), (now.date(), 2)]
+    assert stats['total'] == 3
+    assert [tuple(row) for row in stats['by_source']] == [('Dhaka Tribune', 2), ('The Daily Star', 1)]
+    assert [tuple(row) for row in stats['by_category']] == [('Politics', 2)]
+    assert [tuple(row) for row in stats['scrapes']] == [('Dhaka Tribune', 2, 1, 10, 4)]
+
+    assert window_stats(90)['total'] == 4
+
+def test_rebuild_recounts_stored_rows(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1', category='Politics'))
+        writer.add(make_row('https://example.com/2', title='Tea garden workers demand higher wages'))
+    record_articles([(datetime.utcnow(), 'Gone Source', '')])
+    db.session.add(ScrapingLog(source='The Daily Star', success=False, articles_found=3, articles_saved=0))
+    db.session.add(ScrapingLog(source='The Daily Star', success=True, articles_found=5, articles_saved=2))
+    Article.query.filter_by(url='https://example.com/2').update({'scraped_date': datetime.utcnow() - timedelta(days=2)})
+    db.session.commit()
+
+    assert rebuild_rollups() == (2, 1)
+    stats = window_stats(30)
+    assert [count for _, count in stats['daily']] == [1, 1]
+    assert [tuple(row) for row in stats['by_source']] == [('The Daily Star', 2)]
+    assert [tuple(row) for row in stats['scrapes']] == [('The Daily Star', 2, 1, 8, 2)]
+
+def test_stats_page_renders_each_window(app, make_row):
+    with ArticleWriter() as writer:
+        writer.add(make_row('https://example.com/1', category='Politics'))
+    client = app.test_client()
+    for days in (30, 90, 365, 7):
+        response = client.get(f'/stats?days={days}')
+        assert response.status_code == 200
+        assert b'The Daily Star' in response.data
@@ -0,0 +1,103 @@
+import pytest
+import requests
+from models import Article
+from scrapers import BaseScraper
+from discovery import feed_directory
+from http_cache import listing_cache
+from ratelimit import rate_limiter
+
+HOST = 'https://news.example/'
+
+def article_page(title):
+    return (f'<html><head><title>{title}</title></head><body><h1>{title}</h1>'
+            f'<p>{title}. Residents of the low-lying areas were moved to shelters overnight.</p></body></html>')
+
+def listing_page(*paths):
+    return '<html><body>' + ''.join(f'<a href="/news/{path}">{path}</a>' for path in paths) + '</body></html>'
+
+class FakeSite:
+    """Serves canned pages by URL and answers a matching If-None-Match with 304, like a real server"""
+
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(url)
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        if url not in self.pages:
+            response.status_code = 404
+            return response
+        body, etag = self.pages[url]
+        if etag and (headers or {}).get('If-None-Match') == etag:
+            response.status_code = 304
+            return response
+        response.status_code = 200
+        response._content = body.encode('utf-8')
+        if etag:
+            response.headers['ETag'] = etag
+        return response
+
+class ExampleScraper(BaseScraper):
+    def __init__(self, site):
+        super().__init__('Example News', HOST)
+        self.session = site
+
+    def is_article_url(self, url):
+        return '/news/' in url
+
+@pytest.fixture
+def site(app, monkeypatch, tmp_path):
+    """A fake news site, with no rate limit and empty feed directory and listing cache"""
+    monkeypatch.setitem(rate_limiter.host_settings, 'news.example', {'rate': 1000.0, 'burst': 1000, 'max_rate': 1000.0})
+    monkeypatch.setattr(rate_limiter, '_buckets', {})
+    monkeypatch.setattr(feed_directory, '_feeds', {})
+    monkeypatch.setattr(listing_cache, 'directory', str(tmp_path))
+    return FakeSite()
+
+def crawl(site):
+    """One incremental crawl with a fresh scraper, as each scheduled run starts"""
+    return ExampleScraper(site).scrape_articles()
+
+def stored_urls():
+    return sorted(url for url, in Article.query.with_entities(Article.url))
+
+def test_a_listing_with_a_failed_article_is_crawled_again(site):
+    site.pages[HOST] = (listing_page('one', 'two'), '"v1"')
+    site.pages[f'{HOST}news/one'] = (article_page('Flood waters rise across Sylhet'), None)
+
+    found, saved, _ = crawl(site)
+    assert (found, saved) == (1, 1)
+
+    # The second article comes back; the unchanged listing must not be answered with 304
+    site.pages[f'{HOST}news/two'] = (article_page('Tea garden workers demand higher wages'), None)
+    found, saved, _ = crawl(site)
+    assert (found, saved) == (1, 1)
+    assert stored_urls() == [f'{HOST}news/one', f'{HOST}news/two']
+
+    # Everything on the page was saved, so now the listing is cached and the next crawl stops at the 304
+    site.requests.clear()
+    assert crawl(site)[:2] == (0, 0)
+    assert f'{HOST}news/one' not in site.requests
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>News</title>
+<item><title>One</title><link>https://news.example/news/one</link></item>
+<item><title>Two</title><link>https://news.example/news/two</link></item>
+</channel></rss>"""
+
+def test_a_probed_feed_with_an_etag_is_crawled(site):
+    site.pages[f'{HOST}feed/'] = (RSS, '"feed-v1"')
+    site.pages[f'{HOST}news/one'] = (article_page('Flood waters rise across Sylhet'), None)
+    site.pages[f'{HOST}news/two'] = (article_page('Tea garden workers demand higher wages'), None)
+
+    found, saved, errors = crawl(site)
+    assert (found, saved, errors) == (2, 2, [])
+    assert stored_urls() == [f'{HOST}news/one', f'{HOST}news/two']
+
+    # Probed once; the second crawl goes straight to the feed and stops at its 304
+    site.requests.clear()
+    assert crawl(site) == (0, 0, [])
+    assert site.requests == [f'{HOST}feed/']
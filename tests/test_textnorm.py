@@ -0,0 +1,19 @@
+from textnorm import normalize, stem, tokenize, index_text
+
+def test_normalize_folds_digits_case_and_invisible_characters():
+    assert normalize('Sylhet\u200b \u09e8\u09e6\u09e8\u09ea') == 'sylhet 2024'
+    # The decomposed and precomposed forms of YYA compare equal
+    assert normalize('\u09af\u09bc') == normalize('\u09df')
+    # Khanda-ta written with a joiner becomes the single code point
+    assert normalize('\u09a4\u09cd\u200d') == '\u09ce'
+
+def test_stem_strips_the_longest_suffix_but_keeps_short_words():
+    assert stem(normalize('খেলোয়াড়দের')) == normalize('খেলোয়াড়')
+    assert stem('বইটি') == 'বইটি'
+    assert stem('floods') == 'floods'
+
+def test_tokenize_and_index_text():
+    assert tokenize('Flood in সিলেটে!') == ['flood', 'in', 'সিলেটে']
+    assert tokenize('গুলো খেলোয়াড়গুলো', stemming=False) == ['গুলো', normalize('খেলোয়াড়গুলো')]
+    assert index_text('A  b') == 'a b'
+    assert normalize(None) == ''
@@ -0,0 +1,23 @@
+from urlcanon import canonicalize_url, bare_host, is_tracking_param
+
+def test_tracking_params_are_dropped_and_the_rest_sorted():
+    url = 'https://example.com/news/story?utm_source=fb&b=2&fbclid=x&a=1#comments'
+    assert canonicalize_url(url) == 'https://example.com/news/story?a=1&b=2'
+
+def test_source_rules_pick_host_scheme_and_trailing_slash():
+    assert canonicalize_url('http://thedailystar.net//news/bangladesh/story/?id=4') == \
+        'https://www.thedailystar.net/news/bangladesh/story'
+    assert canonicalize_url('https://www.dailysylhet.com/news/123') == 'https://dailysylhet.com/news/123/'
+
+def test_relative_urls_resolve_against_the_base():
+    assert canonicalize_url('../sports/5', base='https://bdnews24.com/world/4') == 'https://bdnews24.com/sports/5'
+
+def test_non_web_urls_are_rejected():
+    assert canonicalize_url('mailto:desk@example.com') is None
+    assert canonicalize_url('javascript:void(0)') is None
+    assert canonicalize_url('') is None
+
+def test_helpers():
+    assert bare_host('WWW.Example.COM.') == 'example.com'
+    assert is_tracking_param('UTM_campaign')
+    assert not is_tracking_param('page')
@@ -0,0 +1,54 @@
+import re
+import unicodedata
+
+# Zero-width characters that change how Bangla renders but not what it says
+ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u2060\ufeff'))
+
+# Older text writes khanda ta as ta + virama + ZWJ; fold it into the atomic letter
+KHANDA_TA = ('\u09a4\u09cd\u200d', '\u09ce')
+
+# Bengali digits ০-৯ become ASCII so '২০২৬' and '2026' match
+BENGALI_DIGITS = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
+
+# Letters, digits and the Bengali block up to its vowel signs (currency signs and
+# fractions are left out); vowel signs and the virama stay inside the token
+TOKEN = re.compile(r'[\w\u0980-\u09e3\u09f0\u09f1]+')
+MAX_TOKEN_LENGTH = 64
+
+# Inflectional endings removed by light stemming: plurals, definite articles and
+# case markers. Single-letter endings (-র, -ে) are too ambiguous to strip.
+BANGLA_SUFFIXES = [
+    'গুলোতে', 'গুলোর', 'গুলো', 'গুলির', 'গুলি', 'দেরকে', 'দের', 'েরা', 'য়ের',
+    'ের', 'রা', 'টির', 'টার', 'টি', 'টা', 'কে', 'তে',
+]
+MIN_STEM_LENGTH = 3
+
+def normalize(text):
+    """NFC-normalize, drop zero-width joiners, map Bengali digits and case-fold"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFC', text).replace(*KHANDA_TA)
+    return text.translate(ZERO_WIDTH).translate(BENGALI_DIGITS).casefold()
+
+# Suffixes go through the same normalization as the text they are matched against
+SUFFIXES = sorted({normalize(suffix) for suffix in BANGLA_SUFFIXES}, key=len, reverse=True)
+
+def stem(token):
+    """Strip the longest known Bangla suffix, keeping at least MIN_STEM_LENGTH characters"""
+    if token.isascii():
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+def tokenize(text, stemming=True):
+    """Split text into normalized search tokens"""
+    tokens = [token[:MAX_TOKEN_LENGTH] for token in TOKEN.findall(normalize(text))]
+    if stemming:
+        tokens = [stem(token) for token in tokens]
+    return tokens
+
+def index_text(text):
+    """Text as stored in the search index: its tokens separated by spaces"""
+    return ' '.join(tokenize(text))
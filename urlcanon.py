@@ -0,0 +1,83 @@
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', '_ga'}
+TRACKING_PREFIXES = ('utm_',)
+
+class CanonicalRules:
+    """Per-source canonicalization rules"""
+
+    def __init__(self, host, keep_params=None, scheme='https', trailing_slash=False):
+        # host: the preferred host form ('www.' or not) for this source
+        # keep_params: whitelist of query parameters, or None to keep all but tracking ones
+        self.host = host
+        self.keep_params = keep_params
+        self.scheme = scheme
+        self.trailing_slash = trailing_slash
+
+# Rules keyed by the bare host (without 'www.') of each source
+SOURCE_RULES = {
+    'sylhettoday24.news': CanonicalRules('www.sylhettoday24.news'),
+    'dailysylhet.com': CanonicalRules('dailysylhet.com', trailing_slash=True),
+    'sylhetprotikhon.com': CanonicalRules('sylhetprotikhon.com', trailing_slash=True),
+    'thedailystar.net': CanonicalRules('www.thedailystar.net', keep_params=()),
+    'bdnews24.com': CanonicalRules('bdnews24.com', keep_params=()),
+    'dhakatribune.com': CanonicalRules('www.dhakatribune.com', keep_params=()),
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def bare_host(host):
+    """Return a lowercase host without a leading 'www.'"""
+    host = (host or '').lower().rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+def is_tracking_param(name):
+    """Return True for query parameters that only carry click tracking"""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_url(url, base=None):
+    """Return the canonical form of a (possibly relative) URL, or None if it is not a web URL"""
+    if not url:
+        return None
+
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+
+    rules = SOURCE_RULES.get(bare_host(parts.hostname))
+
+    # Host: use the source's preferred form, otherwise drop 'www.'
+    host = rules.host if rules else bare_host(parts.hostname)
+    if rules and rules.scheme:
+        scheme = rules.scheme
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme) and not rules:
+        host = f"{host}:{port}"
+
+    # Path: collapse duplicate slashes and apply the trailing-slash policy
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    if path != '/':
+        trailing_slash = rules.trailing_slash if rules else False
+        path = path.rstrip('/') + ('/' if trailing_slash else '')
+
+    # Query: drop tracking parameters (or keep only whitelisted ones) and sort the rest
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    if rules and rules.keep_params is not None:
+        params = [(k, v) for k, v in params if k in rules.keep_params]
+    else:
+        params = [(k, v) for k, v in params if not is_tracking_param(k)]
+    query = urlencode(sorted(params))
+
+    # Fragments never identify a different story
+    return urlunsplit((scheme, host, path, query, ''))